@@ -19,7 +19,8 @@ from __future__ import annotations
 import argparse
 import sys
 import time
-from typing import List, Optional, Dict, Any, Tuple
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Dict, Any, Tuple
 
 from core.node import Node
 from core.transaction import Transaction
@@ -28,7 +29,7 @@ from resources.resource_manager import ResourceManager
 from auth.auth import AuthManager
 from consensus.consensus import ConsensusEngine, validate_block_structure
 from logger.audit_logger import log_event, print_audit_log
-from logger.audit_logger import set_events, get_events
+from logger.audit_logger import set_events, get_events, clear_events
 from persistence import save_state, load_state, DEFAULT_STATE_FILE
 
 
@@ -40,18 +41,23 @@ class IntegratedCLI:
     interactions between components in a clear and modular way.
     """
 
-    def __init__(self, difficulty: int = 2, state_file: str = None):
+    def __init__(self, difficulty: int = 2, state_file: str = None, verbose: bool = True):
         # Core components
         self.blockchain = Blockchain(difficulty=difficulty)
         self.resource_manager = ResourceManager()
         self.auth = AuthManager()
         # consensus engine is created once there are nodes; keep None until then
         self.consensus: Optional[ConsensusEngine] = None
+        # Whether the consensus engine prints its voting narration
+        self.verbose = verbose
         # Persistence
         self.state_file = DEFAULT_STATE_FILE if state_file is None else DEFAULT_STATE_FILE.parent.joinpath(state_file)
         # Track if file has been tampered with
         self.file_tampered = False
         self.tamper_message = ""
+        # Write coalescing: saves requested inside batched() are deferred
+        self._batch_depth = 0
+        self._dirty = False
         # Attempt to load existing state
         self._load_state()
 
@@ -116,10 +122,10 @@ class IntegratedCLI:
         if not node_list:
             self.consensus = None
             return
-        # Create a new consensus engine (vote threshold default majority)
-        self.consensus = ConsensusEngine(node_list)
-        # After updating consensus, save the state
-        self._save_state()
+        # Create a new consensus engine (vote threshold default majority).
+        # The engine is derived from the node list and not persisted, so
+        # there is nothing to save here; callers that change nodes save.
+        self.consensus = ConsensusEngine(node_list, verbose=self.verbose)
 
     # ---------------- Resource operations ----------------
     def request_resource(self, node_id: str, resource: str, amount: float) -> str:
@@ -128,24 +134,26 @@ class IntegratedCLI:
         This function demonstrates the pipeline: validate inputs -> build transaction ->
         build block and mine -> ask consensus -> on approval apply to resource manager and append to chain.
         """
-        # Basic validations
-        if node_id not in self.resource_manager.nodes:
+        # Basic validations (the node and chain are looked up once and reused below)
+        node = self.resource_manager.nodes.get(node_id)
+        if node is None:
             raise ValueError(f"Unknown node: {node_id}")
-        if resource not in self.resource_manager.nodes[node_id].quotas:
+        if resource not in node.quotas:
             raise ValueError(f"Invalid resource: {resource}")
         if amount <= 0:
             raise ValueError("Amount must be greater than zero")
 
         # Check node-level quota
-        if not self.resource_manager.can_allocate(node_id, resource, amount):
+        if not node.can_allocate(resource, amount):
             raise ValueError(f"Allocation would exceed quota for {node_id}")
 
         # Build transaction (validated by Transaction class)
         tx = Transaction(node_id=node_id, resource_type=resource, amount=amount, transaction_type='allocate')
 
         # Build a candidate block (not appended yet)
-        index = len(self.blockchain.chain)
-        prev_hash = self.blockchain.chain[-1].hash if self.blockchain.chain else '0'
+        chain = self.blockchain.chain
+        index = len(chain)
+        prev_hash = chain[-1].hash if chain else '0'
         block = Block(index=index, timestamp=time.time(), transactions=[tx.to_dict()], previous_hash=prev_hash)
         # Mine block (compute nonce and hash)
         block.hash = self.blockchain.proof_of_work(block)
@@ -161,25 +169,27 @@ class IntegratedCLI:
             raise RuntimeError(f"Consensus rejected the block: {details}")
 
         # On approval, apply allocation and append block to blockchain
-        self.resource_manager.apply_allocation(node_id, resource, amount)
-        self.blockchain.chain.append(block)
+        node.allocate(resource, amount)
+        chain.append(block)
         log_event(node_id, 'request_resource', 'accepted', {'resource': resource, 'amount': amount, 'block_hash': block.hash})
         self._save_state()
         return f"Allocation accepted and committed in block {block.index} (hash={block.hash})"
 
     def release_resource(self, node_id: str, resource: str, amount: float) -> str:
         """Process a resource release request similar to request_resource."""
-        if node_id not in self.resource_manager.nodes:
+        node = self.resource_manager.nodes.get(node_id)
+        if node is None:
             raise ValueError(f"Unknown node: {node_id}")
         if amount <= 0:
             raise ValueError("Amount must be greater than zero")
-        if not self.resource_manager.nodes[node_id].can_release(resource, amount):
+        if not node.can_release(resource, amount):
             raise ValueError(f"Node {node_id} does not have {amount} {resource} allocated")
 
         tx = Transaction(node_id=node_id, resource_type=resource, amount=amount, transaction_type='release')
 
-        index = len(self.blockchain.chain)
-        prev_hash = self.blockchain.chain[-1].hash if self.blockchain.chain else '0'
+        chain = self.blockchain.chain
+        index = len(chain)
+        prev_hash = chain[-1].hash if chain else '0'
         block = Block(index=index, timestamp=time.time(), transactions=[tx.to_dict()], previous_hash=prev_hash)
         block.hash = self.blockchain.proof_of_work(block)
 
@@ -192,8 +202,8 @@ class IntegratedCLI:
             raise RuntimeError(f"Consensus rejected the block: {details}")
 
         # Apply release and append block
-        self.resource_manager.apply_release(node_id, resource, amount)
-        self.blockchain.chain.append(block)
+        node.release(resource, amount)
+        chain.append(block)
         log_event(node_id, 'release_resource', 'accepted', {'resource': resource, 'amount': amount, 'block_hash': block.hash})
         self._save_state()
         return f"Release accepted and committed in block {block.index} (hash={block.hash})"
@@ -259,7 +269,11 @@ class IntegratedCLI:
         # Load chain
         chain_data = data.get('chain', [])
         if chain_data:
-            self.blockchain = Blockchain.from_dict(chain_data, difficulty=self.blockchain.difficulty)
+            # A verified checksum makes the fast path likely to apply; the
+            # checksum is unkeyed though, so from_dict falls back on bad blocks
+            self.blockchain = Blockchain.from_dict(chain_data, difficulty=self.blockchain.difficulty,
+                                                   workers=self.blockchain.workers,
+                                                   trusted=not self.file_tampered)
         # Load audit events
         audit_events = data.get('audit_events', [])
         if audit_events:
@@ -267,11 +281,58 @@ class IntegratedCLI:
         # Update consensus engine after load
         self._update_consensus_engine()
 
+    def reset(self) -> None:
+        """Return to a fresh genesis-only state in memory.
+
+        Drops nodes, tokens, blocks after genesis, audit events, a pending
+        batch and any tampering detected on load. The state file is left
+        alone.
+        """
+        self.resource_manager.nodes.clear()
+        self.auth.tokens.clear()
+        self.consensus = None
+        del self.blockchain.chain[1:]
+        clear_events()
+        self.file_tampered = False
+        self.tamper_message = ""
+        self._batch_depth = 0
+        self._dirty = False
+
+    @contextmanager
+    def batched(self) -> Iterator[None]:
+        """Defer state writes until the outermost batched() block exits.
+
+        Every operation still marks the state dirty, but the file is
+        written once on exit (also when the block raises) instead of once
+        per operation. Blocks may be nested.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+
+    def flush(self) -> None:
+        """Write the state file now if there are unsaved changes."""
+        if self._dirty:
+            self._write_state()
+
     def _save_state(self):
+        self._dirty = True
+        if self._batch_depth == 0:
+            self._write_state()
+
+    def _write_state(self):
         nodes = [n.to_dict() for n in self.resource_manager.nodes.values()]
         chain = self.blockchain.to_dict()
+        # Cached block encodings feed the checksum; an edited block is re-encoded
+        chain_json = [b.canonical_json() for b in self.blockchain.chain]
         audit_events = get_events()
-        save_state(self.state_file, nodes=nodes, chain=chain, audit_events=audit_events)
+        save_state(self.state_file, nodes=nodes, chain=chain, audit_events=audit_events, chain_json=chain_json)
+        # Only now: a failed write leaves the state dirty for the next flush
+        self._dirty = False
 
 # ---------------- Command-line wiring ----------------
 
@@ -333,12 +394,12 @@ def run_cli(argv: Optional[List[str]] = None) -> int:
             msg = cli.request_resource(args.node_id, args.resource, args.amount)
             print(msg)
             # Show allocation
-            print('Allocation state:', cli.resource_manager.get_status()['nodes'].get(args.node_id))
+            print('Allocation state:', cli.resource_manager.get_node_status(args.node_id))
 
         elif args.command == 'release_resource':
             msg = cli.release_resource(args.node_id, args.resource, args.amount)
             print(msg)
-            print('Allocation state:', cli.resource_manager.get_status()['nodes'].get(args.node_id))
+            print('Allocation state:', cli.resource_manager.get_node_status(args.node_id))
 
         elif args.command == 'view_chain':
             serialized = cli.view_chain()
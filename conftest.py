@@ -3,6 +3,39 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 # Add the project root directory to Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
+
+
+@pytest.fixture(autouse=True)
+def _no_fsync_in_tests(monkeypatch):
+    """Skip fsyncs in save_state; test state lives in throwaway temp dirs."""
+    import persistence
+    monkeypatch.setattr(persistence, "DEFAULT_DURABILITY", "none")
+
+
+@pytest.fixture(scope="module")
+def _shared_controller(tmp_path_factory):
+    """One MainController per test module; see `controller`."""
+    from controller import MainController
+    state_file = tmp_path_factory.mktemp("state") / "test_state.json"
+    # Quiet, so tests don't format and print the consensus narration
+    shared = MainController(state_file=str(state_file), difficulty=1, verbose=False)
+    yield shared
+    shared.stop()
+
+
+@pytest.fixture
+def controller(_shared_controller):
+    """A MainController reset to a fresh genesis-only state.
+
+    The controller is built once per module and reset before each test,
+    which is cheaper than constructing (and mining genesis for) a new one.
+    """
+    cli = _shared_controller.cli
+    cli.reset()
+    cli.state_file.unlink(missing_ok=True)
+    return _shared_controller
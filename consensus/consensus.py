@@ -24,15 +24,18 @@ class ConsensusEngine:
     Attributes:
         nodes (list): List of node identifiers participating in consensus
         vote_threshold (float): Percentage needed for approval (default 0.5 for majority)
+        verbose (bool): Whether to print the step-by-step voting narration
     """
     
-    def __init__(self, nodes, vote_threshold=0.5):
+    def __init__(self, nodes, vote_threshold=0.5, verbose=True):
         """
         Initialize the consensus engine.
         
         Args:
             nodes (list): List of node objects or node IDs that can vote
             vote_threshold (float): Fraction of votes needed (0.5 = majority, 0.66 = supermajority)
+            verbose (bool): Print the voting narration (default True). Pass False
+                           for bulk or programmatic use so no output is formatted.
         
         Raises:
             ValueError: If nodes list is empty or threshold is invalid
@@ -45,11 +48,13 @@ class ConsensusEngine:
         
         self.nodes = nodes
         self.vote_threshold = vote_threshold
+        self.verbose = verbose
         
-        print(f"\n[CONSENSUS ENGINE INITIALIZED]")
-        print(f"  Total Nodes: {len(self.nodes)}")
-        print(f"  Vote Threshold: {vote_threshold * 100}%")
-        print(f"  Votes Required: {self._calculate_required_votes()} of {len(self.nodes)}")
+        if verbose:
+            print(f"\n[CONSENSUS ENGINE INITIALIZED]")
+            print(f"  Total Nodes: {len(self.nodes)}")
+            print(f"  Vote Threshold: {vote_threshold * 100}%")
+            print(f"  Votes Required: {self._calculate_required_votes()} of {len(self.nodes)}")
     
     
     def _calculate_required_votes(self):
@@ -93,29 +98,35 @@ class ConsensusEngine:
         if block is None:
             raise ValueError("Cannot request consensus on None block")
         
-        print(f"\n{'='*70}")
-        print(f"[CONSENSUS REQUEST INITIATED]")
-        print(f"  Block Index: {getattr(block, 'index', 'N/A')}")
-        print(f"  Block Hash: {getattr(block, 'hash', 'N/A')[:16]}...")
-        print(f"  Transactions: {len(getattr(block, 'transactions', []))}")
-        print(f"{'='*70}")
+        verbose = self.verbose
+        if verbose:
+            print(f"\n{'='*70}")
+            print(f"[CONSENSUS REQUEST INITIATED]")
+            print(f"  Block Index: {getattr(block, 'index', 'N/A')}")
+            print(f"  Block Hash: {getattr(block, 'hash', 'N/A')[:16]}...")
+            print(f"  Transactions: {len(getattr(block, 'transactions', []))}")
+            print(f"{'='*70}")
         
         # Step 1: Pre-validation (optional)
         if validator_func:
-            print("\n[STEP 1: PRE-VALIDATION]")
+            if verbose:
+                print("\n[STEP 1: PRE-VALIDATION]")
             is_valid, reason = validator_func(block)
             if not is_valid:
-                print(f"  ✗ Block failed pre-validation: {reason}")
+                if verbose:
+                    print(f"  ✗ Block failed pre-validation: {reason}")
                 return False, {
                     'votes_for': 0,
                     'votes_against': len(self.nodes),
                     'abstentions': 0,
                     'reason': f'Pre-validation failed: {reason}'
                 }
-            print(f"  ✓ Block passed pre-validation")
+            if verbose:
+                print(f"  ✓ Block passed pre-validation")
         
         # Step 2: Simulate voting from each node
-        print("\n[STEP 2: COLLECTING VOTES]")
+        if verbose:
+            print("\n[STEP 2: COLLECTING VOTES]")
         votes_for = 0
         votes_against = 0
         abstentions = 0
@@ -136,9 +147,15 @@ class ConsensusEngine:
                 abstentions += 1
                 symbol = "○"
             
-            # Get node identifier for display
-            node_id = getattr(node, 'node_id', f'Node_{i}')
-            print(f"  {symbol} {node_id}: {vote}")
+            # Get node identifier for display; the fallback name is only
+            # formatted for nodes without one (a getattr default would be
+            # built on every vote)
+            try:
+                node_id = node.node_id
+            except AttributeError:
+                node_id = f'Node_{i}'
+            if verbose:
+                print(f"  {symbol} {node_id}: {vote}")
             
             voting_record.append({
                 'node': node_id,
@@ -146,26 +163,28 @@ class ConsensusEngine:
             })
         
         # Step 3: Count votes and determine consensus
-        print(f"\n[STEP 3: VOTE COUNTING]")
-        print(f"  Votes FOR:     {votes_for}")
-        print(f"  Votes AGAINST: {votes_against}")
-        print(f"  Abstentions:   {abstentions}")
-        print(f"  Total Votes:   {len(self.nodes)}")
-        
         required_votes = self._calculate_required_votes()
-        print(f"\n[STEP 4: CONSENSUS DECISION]")
-        print(f"  Required for Approval: {required_votes}")
-        print(f"  Received:              {votes_for}")
         
         # Consensus is reached if votes_for meets or exceeds required threshold
         consensus_reached = votes_for >= required_votes
         
-        if consensus_reached:
-            print(f"  ✓ CONSENSUS REACHED - Block ACCEPTED")
-        else:
-            print(f"  ✗ CONSENSUS FAILED - Block REJECTED")
-        
-        print(f"{'='*70}\n")
+        if verbose:
+            print(f"\n[STEP 3: VOTE COUNTING]")
+            print(f"  Votes FOR:     {votes_for}")
+            print(f"  Votes AGAINST: {votes_against}")
+            print(f"  Abstentions:   {abstentions}")
+            print(f"  Total Votes:   {len(self.nodes)}")
+            
+            print(f"\n[STEP 4: CONSENSUS DECISION]")
+            print(f"  Required for Approval: {required_votes}")
+            print(f"  Received:              {votes_for}")
+            
+            if consensus_reached:
+                print(f"  ✓ CONSENSUS REACHED - Block ACCEPTED")
+            else:
+                print(f"  ✗ CONSENSUS FAILED - Block REJECTED")
+            
+            print(f"{'='*70}\n")
         
         # Return detailed results
         return consensus_reached, {
@@ -244,10 +263,11 @@ class ConsensusEngine:
         self.nodes = new_nodes
         new_count = len(self.nodes)
         
-        print(f"\n[CONSENSUS ENGINE UPDATED]")
-        print(f"  Previous Node Count: {old_count}")
-        print(f"  New Node Count: {new_count}")
-        print(f"  New Required Votes: {self._calculate_required_votes()} of {new_count}")
+        if self.verbose:
+            print(f"\n[CONSENSUS ENGINE UPDATED]")
+            print(f"  Previous Node Count: {old_count}")
+            print(f"  New Node Count: {new_count}")
+            print(f"  New Required Votes: {self._calculate_required_votes()} of {new_count}")
     
     
     def get_consensus_info(self):
@@ -14,17 +14,40 @@ from __future__ import annotations
 import logging
 import argparse
 import json
+import os
+import selectors
 import socket
+import struct
 import threading
-from typing import Dict, Any, Optional
+import time
+from typing import Callable, Dict, Any, List, Optional
 from datetime import datetime
 
 from cli.cli import IntegratedCLI
 
-# Setup basic logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Socket API responses are framed as a 4-byte big-endian length + UTF-8 JSON body
+_FRAME_HEADER = struct.Struct(">I")
+# Seconds the socket API loop waits for activity before rechecking for shutdown
+_SELECT_TIMEOUT = 0.2
+
+
+def _encode_frame(message: Dict[str, Any]) -> bytes:
+    """Encode a socket API response as one length-prefixed frame."""
+    body = json.dumps(message, separators=(',', ':')).encode('utf-8')
+    return _FRAME_HEADER.pack(len(body)) + body
+
+
+class _SocketClient:
+    """Per-connection state of the socket API: peer address and unsent output."""
+
+    __slots__ = ("addr", "outbuf")
+
+    def __init__(self, addr):
+        self.addr = addr
+        self.outbuf = bytearray()
+
 
 class MainController:
     """Orchestrates the interaction between all system modules.
@@ -35,12 +58,26 @@ class MainController:
     long-running process interaction with persistent state.
     """
 
-    def __init__(self, state_file: str = None, difficulty: int = 2):
+    def __init__(self, state_file: str = None, difficulty: int = 2, verbose: bool = True):
         self.config: Dict[str, Any] = {}
         self.is_running = False
-        self.cli = IntegratedCLI(difficulty=difficulty, state_file=state_file)
+        # verbose=False silences the consensus narration (e.g. for API use)
+        self.cli = IntegratedCLI(difficulty=difficulty, state_file=state_file, verbose=verbose)
         self.socket_server: Optional[socket.socket] = None
         self.socket_thread: Optional[threading.Thread] = None
+        # Filesystem path of the socket when serving over a Unix domain socket
+        self.socket_path: Optional[str] = None
+        # Command name -> handler, built once instead of an if/elif chain per call
+        self._commands: Dict[str, Callable[[List[str]], Dict[str, Any]]] = {
+            'add_node': self._cmd_add_node,
+            'request_resource': self._cmd_request_resource,
+            'release_resource': self._cmd_release_resource,
+            'view_chain': self._cmd_view_chain,
+            'validate_chain': self._cmd_validate_chain,
+            'print_audit': self._cmd_print_audit,
+            'status': self._cmd_status,
+            'help': self._cmd_help,
+        }
 
     def start(self):
         """Start the controller."""
@@ -56,8 +93,21 @@ class MainController:
         logger.info("Stopping main controller")
         if self.socket_server:
             self.stop_socket_api()
+        self.flush()
         self.is_running = False
 
+    def batched(self):
+        """Context manager that coalesces state writes of several commands.
+
+        Commands run inside ``with controller.batched():`` update state in
+        memory and the state file is written once when the block exits.
+        """
+        return self.cli.batched()
+
+    def flush(self):
+        """Write any state changes deferred by `batched` to disk."""
+        self.cli.flush()
+
     def handle_command(self, command_str: str) -> Dict[str, Any]:
         """Process a command string and return result as a dictionary.
 
@@ -69,92 +119,101 @@ class MainController:
             return {"success": False, "message": "Empty command"}
 
         cmd = parts[0].lower()
+        handler = self._commands.get(cmd)
+        if handler is None:
+            return {"success": False, "message": f"Unknown command: {cmd}. Type 'help' for available commands."}
 
         try:
-            if cmd == 'add_node':
-                if len(parts) < 2:
-                    return {"success": False, "message": "Usage: add_node <node_id> [cpu] [memory] [storage] [bandwidth]"}
-                node_id = parts[1]
-                cpu = float(parts[2]) if len(parts) > 2 else 0.0
-                memory = float(parts[3]) if len(parts) > 3 else 0.0
-                storage = float(parts[4]) if len(parts) > 4 else 0.0
-                bandwidth = float(parts[5]) if len(parts) > 5 else 0.0
-                quotas = {'CPU': cpu, 'Memory': memory, 'Storage': storage, 'Bandwidth': bandwidth}
-                msg = self.cli.add_node(node_id, quotas)
-                return {"success": True, "message": msg}
-
-            elif cmd == 'request_resource':
-                if len(parts) != 4:
-                    return {"success": False, "message": "Usage: request_resource <node_id> <resource> <amount>"}
-                node_id, resource, amount = parts[1], parts[2], float(parts[3])
-                msg = self.cli.request_resource(node_id, resource, amount)
-                node_status = self.cli.resource_manager.get_status()['nodes'].get(node_id)
-                return {"success": True, "message": msg, "data": {"node_status": node_status}}
-
-            elif cmd == 'release_resource':
-                if len(parts) != 4:
-                    return {"success": False, "message": "Usage: release_resource <node_id> <resource> <amount>"}
-                node_id, resource, amount = parts[1], parts[2], float(parts[3])
-                msg = self.cli.release_resource(node_id, resource, amount)
-                node_status = self.cli.resource_manager.get_status()['nodes'].get(node_id)
-                return {"success": True, "message": msg, "data": {"node_status": node_status}}
-
-            elif cmd == 'view_chain':
-                chain_data = self.cli.view_chain()
-                return {"success": True, "message": "Blockchain retrieved", "data": {"chain": chain_data}}
-
-            elif cmd == 'validate_chain':
-                ok, reason = self.cli.validate_chain()
-                if ok:
-                    return {"success": True, "message": reason, "data": {"valid": ok}}
-                else:
-                    return {"success": False, "message": reason, "data": {"valid": ok}}
-
-            elif cmd == 'print_audit':
-                from logger.audit_logger import get_events
-                events = get_events()
-                return {"success": True, "message": "Audit log retrieved", "data": {"events": events}}
-
-            elif cmd == 'status':
-                # Gather comprehensive system status
-                nodes = self.cli.resource_manager.nodes
-                chain_length = len(self.cli.blockchain.chain)
-
-                # Calculate total resources
-                total_allocated = {'CPU': 0.0, 'Memory': 0.0, 'Storage': 0.0, 'Bandwidth': 0.0}
-                total_quotas = {'CPU': 0.0, 'Memory': 0.0, 'Storage': 0.0, 'Bandwidth': 0.0}
-
-                for node in nodes.values():
-                    for resource in ['CPU', 'Memory', 'Storage', 'Bandwidth']:
-                        total_allocated[resource] += node.allocated.get(resource, 0.0)
-                        total_quotas[resource] += node.quotas.get(resource, 0.0)
-
-                st = {
-                    'timestamp': datetime.now().isoformat(),
-                    'node_count': len(nodes),
-                    'node_ids': list(nodes.keys()),
-                    'blockchain': {
-                        'total_blocks': chain_length,
-                        'difficulty': self.cli.blockchain.difficulty,
-                        'last_block_hash': self.cli.blockchain.chain[-1].hash[:16] + '...' if chain_length > 0 else 'N/A'
-                    },
-                    'resources': {
-                        'total_quotas': total_quotas,
-                        'total_allocated': total_allocated,
-                        'utilization': {
-                            res: f"{(total_allocated[res]/total_quotas[res]*100):.1f}%" if total_quotas[res] > 0 else "0.0%"
-                            for res in ['CPU', 'Memory', 'Storage', 'Bandwidth']
-                        }
-                    },
-                    'consensus': {
-                        'total_nodes': len(nodes),
-                        'votes_required': len(nodes) // 2 + 1 if len(nodes) > 0 else 0,
-                        'vote_threshold': '50.0%'
-                    }
-                }
+            return handler(parts[1:])
+        except Exception as e:
+            logger.exception(f"Error processing command: {command_str}")
+            return {"success": False, "message": f"Error: {type(e).__name__}: {str(e)}"}
 
-                # Format a nice status display
-                status_msg = f"""
+    # Command handlers: each takes the arguments after the command name
+    def _cmd_add_node(self, args) -> Dict[str, Any]:
+        if not args:
+            return {"success": False, "message": "Usage: add_node <node_id> [cpu] [memory] [storage] [bandwidth]"}
+        node_id = args[0]
+        cpu = float(args[1]) if len(args) > 1 else 0.0
+        memory = float(args[2]) if len(args) > 2 else 0.0
+        storage = float(args[3]) if len(args) > 3 else 0.0
+        bandwidth = float(args[4]) if len(args) > 4 else 0.0
+        quotas = {'CPU': cpu, 'Memory': memory, 'Storage': storage, 'Bandwidth': bandwidth}
+        msg = self.cli.add_node(node_id, quotas)
+        return {"success": True, "message": msg}
+
+    def _cmd_request_resource(self, args) -> Dict[str, Any]:
+        if len(args) != 3:
+            return {"success": False, "message": "Usage: request_resource <node_id> <resource> <amount>"}
+        node_id, resource, amount = args[0], args[1], float(args[2])
+        msg = self.cli.request_resource(node_id, resource, amount)
+        node_status = self.cli.resource_manager.get_node_status(node_id)
+        return {"success": True, "message": msg, "data": {"node_status": node_status}}
+
+    def _cmd_release_resource(self, args) -> Dict[str, Any]:
+        if len(args) != 3:
+            return {"success": False, "message": "Usage: release_resource <node_id> <resource> <amount>"}
+        node_id, resource, amount = args[0], args[1], float(args[2])
+        msg = self.cli.release_resource(node_id, resource, amount)
+        node_status = self.cli.resource_manager.get_node_status(node_id)
+        return {"success": True, "message": msg, "data": {"node_status": node_status}}
+
+    def _cmd_view_chain(self, args) -> Dict[str, Any]:
+        chain_data = self.cli.view_chain()
+        return {"success": True, "message": "Blockchain retrieved", "data": {"chain": chain_data}}
+
+    def _cmd_validate_chain(self, args) -> Dict[str, Any]:
+        ok, reason = self.cli.validate_chain()
+        if ok:
+            return {"success": True, "message": reason, "data": {"valid": ok}}
+        else:
+            return {"success": False, "message": reason, "data": {"valid": ok}}
+
+    def _cmd_print_audit(self, args) -> Dict[str, Any]:
+        from logger.audit_logger import get_events
+        events = get_events()
+        return {"success": True, "message": "Audit log retrieved", "data": {"events": events}}
+
+    def _cmd_status(self, args) -> Dict[str, Any]:
+        # Gather comprehensive system status
+        nodes = self.cli.resource_manager.nodes
+        chain_length = len(self.cli.blockchain.chain)
+
+        # Calculate total resources
+        total_allocated = {'CPU': 0.0, 'Memory': 0.0, 'Storage': 0.0, 'Bandwidth': 0.0}
+        total_quotas = {'CPU': 0.0, 'Memory': 0.0, 'Storage': 0.0, 'Bandwidth': 0.0}
+
+        for node in nodes.values():
+            for resource in ['CPU', 'Memory', 'Storage', 'Bandwidth']:
+                total_allocated[resource] += node.allocated.get(resource, 0.0)
+                total_quotas[resource] += node.quotas.get(resource, 0.0)
+
+        st = {
+            'timestamp': datetime.now().isoformat(),
+            'node_count': len(nodes),
+            'node_ids': list(nodes.keys()),
+            'blockchain': {
+                'total_blocks': chain_length,
+                'difficulty': self.cli.blockchain.difficulty,
+                'last_block_hash': self.cli.blockchain.chain[-1].hash[:16] + '...' if chain_length > 0 else 'N/A'
+            },
+            'resources': {
+                'total_quotas': total_quotas,
+                'total_allocated': total_allocated,
+                'utilization': {
+                    res: f"{(total_allocated[res]/total_quotas[res]*100):.1f}%" if total_quotas[res] > 0 else "0.0%"
+                    for res in ['CPU', 'Memory', 'Storage', 'Bandwidth']
+                }
+            },
+            'consensus': {
+                'total_nodes': len(nodes),
+                'votes_required': len(nodes) // 2 + 1 if len(nodes) > 0 else 0,
+                'vote_threshold': '50.0%'
+            }
+        }
+
+        # Format a nice status display
+        status_msg = f"""
 ╔══════════════════════════════════════════════════════════════╗
 ║              BLOCKCHAIN OS - SYSTEM STATUS                   ║
 ╚══════════════════════════════════════════════════════════════╝
@@ -182,10 +241,10 @@ class MainController:
 
 ════════════════════════════════════════════════════════════════
 """
-                return {"success": True, "message": status_msg.strip(), "data": st}
+        return {"success": True, "message": status_msg.strip(), "data": st}
 
-            elif cmd == 'help':
-                help_text = """
+    def _cmd_help(self, args) -> Dict[str, Any]:
+        help_text = """
 Available commands:
   add_node <id> [cpu] [memory] [storage] [bandwidth] - Register a new node
   request_resource <id> <resource> <amount>          - Request resource allocation
@@ -197,14 +256,7 @@ Available commands:
   help                                                - Show this help message
   exit/quit                                           - Exit the controller
 """
-                return {"success": True, "message": help_text.strip()}
-
-            else:
-                return {"success": False, "message": f"Unknown command: {cmd}. Type 'help' for available commands."}
-
-        except Exception as e:
-            logger.exception(f"Error processing command: {command_str}")
-            return {"success": False, "message": f"Error: {type(e).__name__}: {str(e)}"}
+        return {"success": True, "message": help_text.strip()}
 
     def repl(self):
         """Simple interactive REPL that accepts commands.
@@ -291,67 +343,154 @@ Available commands:
         print('===================\n')
 
     # Socket API methods
-    def start_socket_api(self, host: str = 'localhost', port: int = 9999):
+    def start_socket_api(self, host: str = 'localhost', port: int = 9999, unix_path: Optional[str] = None):
         """Start a socket-based API server for programmatic access.
 
-        The server accepts JSON commands and returns JSON responses.
+        The server accepts JSON commands and returns JSON responses. Each
+        response is sent as a 4-byte big-endian length followed by that many
+        bytes of UTF-8 JSON, so clients never have to guess its size.
+
+        If `unix_path` is given the server listens on a Unix domain socket at
+        that path instead of TCP `host`:`port` (local clients only, POSIX only).
         """
         if self.socket_server:
             logger.warning("Socket API already running")
             return
 
-        self.socket_server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.socket_server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.socket_server.bind((host, port))
-        self.socket_server.listen(5)
+        # Bind and listen on the caller's thread: once this returns the
+        # address is known and clients can connect (queued by the backlog)
+        if unix_path is not None:
+            srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            address = unix_path
+        else:
+            srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            address = f"{host}:{port}"
+        try:
+            srv.bind(unix_path if unix_path is not None else (host, port))
+            srv.listen(16)
+        except OSError:
+            srv.close()
+            raise
+        self.socket_server = srv
+        self.socket_path = unix_path
+
+        logger.info(f"Socket API listening on {address}")
+
+        # Register before the thread starts, so a quick stop can't close srv first
+        srv.setblocking(False)
+        sel = selectors.DefaultSelector()
+        sel.register(srv, selectors.EVENT_READ)
+
+        # Only the serving loop runs in the background thread
+        self.socket_thread = threading.Thread(target=self._socket_accept_loop, args=(srv, sel), daemon=True)
+        self.socket_thread.start()
 
-        logger.info(f"Socket API listening on {host}:{port}")
+    def _socket_accept_loop(self, srv: socket.socket, sel: selectors.BaseSelector):
+        """Serve the socket API on `srv` (registered with `sel`) from this one thread.
 
-        self.socket_thread = threading.Thread(target=self._socket_accept_loop, daemon=True)
-        self.socket_thread.start()
+        A selector multiplexes the listening socket and every client
+        connection, so no thread is started per client. Commands are short
+        and are handled one at a time in arrival order, which also keeps
+        clients from running commands against the controller concurrently.
 
-    def _socket_accept_loop(self):
-        """Accept incoming socket connections and handle them."""
-        while self.is_running and self.socket_server:
-            try:
-                client_sock, addr = self.socket_server.accept()
-                logger.info(f"Socket connection from {addr}")
-                # Handle each client in a separate thread
-                client_thread = threading.Thread(
-                    target=self._handle_socket_client,
-                    args=(client_sock, addr),
-                    daemon=True
-                )
-                client_thread.start()
-            except Exception as e:
-                if self.is_running:
-                    logger.error(f"Error accepting socket connection: {e}")
-                break
+        Client sockets are non-blocking. A response that doesn't fit in the
+        socket buffer waits in that client's output buffer and is sent as the
+        client reads, so a slow reader never stalls the others. Until its
+        output is drained a client's next command is not read.
+        """
+        try:
+            while self.is_running and self.socket_server is srv:
+                # The timeout bounds how long the loop outlives stop_socket_api()
+                for key, mask in sel.select(timeout=_SELECT_TIMEOUT):
+                    if key.fileobj is srv:
+                        self._accept_socket_client(srv, sel)
+                    elif mask & selectors.EVENT_WRITE:
+                        self._flush_socket_client(key.fileobj, key.data, sel)
+                    else:
+                        self._serve_socket_client(key.fileobj, key.data, sel)
+        except Exception as e:
+            # Closing the listening socket can surface here as a bad descriptor
+            if self.is_running and self.socket_server is srv:
+                logger.error(f"Error in socket API loop: {e}")
+        finally:
+            for key in list(sel.get_map().values()):
+                if key.fileobj is not srv:
+                    key.fileobj.close()
+            sel.close()
 
-    def _handle_socket_client(self, client_sock: socket.socket, addr):
-        """Handle a single socket client connection."""
+    def _accept_socket_client(self, srv: socket.socket, sel: selectors.BaseSelector):
+        """Accept a pending connection and register it with the selector."""
         try:
-            with client_sock:
-                while self.is_running:
-                    # Read command (expect JSON with 'command' field)
-                    data = client_sock.recv(4096)
-                    if not data:
-                        break
+            client_sock, addr = srv.accept()
+        except BlockingIOError:
+            # The client gave up between readiness and accept()
+            return
+        except OSError as e:
+            logger.error(f"Error accepting socket connection: {e}")
+            return
+        logger.info(f"Socket connection from {addr}")
+        client_sock.setblocking(False)
+        sel.register(client_sock, selectors.EVENT_READ, _SocketClient(addr))
+
+    def _serve_socket_client(self, client_sock: socket.socket, client: _SocketClient, sel: selectors.BaseSelector):
+        """Handle one command from a readable client connection.
 
-                    try:
-                        request = json.loads(data.decode('utf-8'))
-                        command = request.get('command', '')
+        The connection is closed when the client disconnects or fails.
+        """
+        try:
+            # Read command (expect JSON with 'command' field)
+            data = client_sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            logger.error(f"Error handling socket client {client.addr}: {e}")
+            data = b''
+        if not data:
+            self._close_socket_client(client_sock, sel)
+            return
 
-                        result = self.handle_command(command)
-                        response = json.dumps(result) + '\n'
-                        client_sock.sendall(response.encode('utf-8'))
+        try:
+            request = json.loads(data.decode('utf-8'))
+            command = request.get('command', '')
 
-                    except json.JSONDecodeError:
-                        error = {"success": False, "message": "Invalid JSON"}
-                        client_sock.sendall((json.dumps(error) + '\n').encode('utf-8'))
+            result = self.handle_command(command)
+            client.outbuf += _encode_frame(result)
 
+        except json.JSONDecodeError:
+            error = {"success": False, "message": "Invalid JSON"}
+            client.outbuf += _encode_frame(error)
         except Exception as e:
-            logger.error(f"Error handling socket client {addr}: {e}")
+            logger.error(f"Error handling socket client {client.addr}: {e}")
+            self._close_socket_client(client_sock, sel)
+            return
+        self._flush_socket_client(client_sock, client, sel)
+
+    def _flush_socket_client(self, client_sock: socket.socket, client: _SocketClient, sel: selectors.BaseSelector):
+        """Send as much pending output as the socket takes without blocking.
+
+        Leftover output switches the connection to waiting for writability;
+        once everything is sent it goes back to reading commands.
+        """
+        outbuf = client.outbuf
+        try:
+            while outbuf:
+                sent = client_sock.send(outbuf)
+                del outbuf[:sent]
+        except BlockingIOError:
+            pass
+        except OSError as e:
+            logger.error(f"Error handling socket client {client.addr}: {e}")
+            self._close_socket_client(client_sock, sel)
+            return
+        events = selectors.EVENT_WRITE if outbuf else selectors.EVENT_READ
+        if sel.get_key(client_sock).events != events:
+            sel.modify(client_sock, events, client)
+
+    def _close_socket_client(self, client_sock: socket.socket, sel: selectors.BaseSelector):
+        """Unregister and close a client connection."""
+        sel.unregister(client_sock)
+        client_sock.close()
 
     def stop_socket_api(self):
         """Stop the socket API server."""
@@ -363,6 +502,13 @@ Available commands:
                 logger.error(f"Error closing socket: {e}")
             self.socket_server = None
             self.socket_thread = None
+            if self.socket_path:
+                # A bound Unix socket leaves its file behind
+                try:
+                    os.unlink(self.socket_path)
+                except OSError:
+                    pass
+                self.socket_path = None
 
 
 def main():
@@ -380,7 +526,13 @@ def main():
 
     args = parser.parse_args()
 
-    controller = MainController(state_file=args.state_file, difficulty=args.difficulty)
+    # Configure logging here rather than at import, so importing the
+    # controller (e.g. from tests) leaves the root logger alone
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    # Nobody reads the consensus narration of a headless socket server
+    controller = MainController(state_file=args.state_file, difficulty=args.difficulty,
+                                verbose=args.mode != 'socket')
 
     try:
         if args.mode == 'socket':
@@ -392,7 +544,6 @@ def main():
             # Keep running until interrupted
             try:
                 while controller.is_running:
-                    import time
                     time.sleep(1)
             except KeyboardInterrupt:
                 print("\nShutting down...")
@@ -27,13 +27,52 @@ It is sufficient for classroom demonstrations and unit tests.
 
 from __future__ import annotations
 
+import copy
+import functools
 import hashlib
 import json
+import multiprocessing
+import sys
 import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 
 
+# Nonces each worker scans per round of the parallel proof-of-work search
+_NONCES_PER_WORKER = 4096
+
+
+def _scan_nonces(args: Tuple[bytes, bytes, str, int, int, int]) -> Optional[Tuple[int, str]]:
+    """Scan ``range(start, stop, step)`` for the first nonce meeting `prefix`.
+
+    Module-level so it can be pickled into worker processes. Returns the
+    ``(nonce, hash)`` pair of the first hit, or None if the range has none.
+    """
+    head, tail, prefix, start, stop, step = args
+    base = hashlib.sha256(head)
+    for nonce in range(start, stop, step):
+        h = base.copy()
+        h.update(str(nonce).encode("utf-8"))
+        h.update(tail)
+        digest = h.hexdigest()
+        if digest.startswith(prefix):
+            return nonce, digest
+    return None
+
+
+@functools.lru_cache(maxsize=8)
+def _genesis_fields(difficulty: int) -> Tuple[float, int, str]:
+    """Mine a genesis block once per difficulty and return (timestamp, nonce, hash).
+
+    Every Blockchain created in this process with the same difficulty
+    reuses the result, so the genesis proof-of-work runs only once.
+    """
+    genesis = Block(index=0, timestamp=time.time(), transactions=[], previous_hash="0")
+    head, tail = Blockchain._hash_parts(genesis)
+    nonce, genesis_hash = _scan_nonces((head, tail, "0" * difficulty, 0, sys.maxsize, 1))
+    return genesis.timestamp, nonce, genesis_hash
+
+
 @dataclass
 class Block:
     """Dataclass representing a single block in the blockchain.
@@ -65,6 +104,22 @@ class Block:
             "hash": self.hash,
         }
 
+    def canonical_json(self) -> bytes:
+        """Return ``json.dumps(self.to_dict(), sort_keys=True)`` as UTF-8 bytes.
+
+        The bytes are cached per block together with a copy of the content
+        they encode. Blocks are plain mutable objects (a tamper demo may edit
+        a mined block's transactions in place), so the cache is only used
+        while every field, transactions included, still equals that copy.
+        """
+        key = (self.index, self.timestamp, self.previous_hash, self.nonce, self.hash)
+        cached = self.__dict__.get("_canonical_json")
+        if cached is not None and cached[0] == key and cached[1] == self.transactions:
+            return cached[2]
+        data = json.dumps(self.to_dict(), sort_keys=True).encode("utf-8")
+        self._canonical_json = (key, copy.deepcopy(self.transactions), data)
+        return data
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Block":
         """Create a Block instance from a dictionary (as produced by to_dict)."""
@@ -77,6 +132,23 @@ class Block:
             hash=str(data.get("hash", "")),
         )
 
+    @classmethod
+    def from_dict_trusted(cls, data: Dict[str, Any]) -> "Block":
+        """Create a Block from a dictionary produced by `to_dict` without coercion.
+
+        Skips the defaulting and type conversion done by `from_dict`. Only use
+        this for data known to come from `to_dict` (e.g. a state file whose
+        checksum verified); malformed input raises KeyError.
+        """
+        block = cls.__new__(cls)
+        block.index = data["index"]
+        block.timestamp = data["timestamp"]
+        block.transactions = data["transactions"]
+        block.previous_hash = data["previous_hash"]
+        block.nonce = data["nonce"]
+        block.hash = data["hash"]
+        return block
+
 
 class Blockchain:
     """A minimal educational blockchain implementation.
@@ -90,13 +162,19 @@ class Blockchain:
     The `difficulty` parameter controls how many leading zeros are required
     in the hex hash for proof-of-work. A small value (e.g., 2) is fine for
     classroom demos and won't consume much CPU.
+
+    The `workers` parameter sets how many processes search for a nonce in
+    parallel. The default of 1 mines in-process; larger values only pay off
+    at higher difficulties where the search outweighs process start-up.
     """
 
-    def __init__(self, difficulty: int = 2) -> None:
+    def __init__(self, difficulty: int = 2, workers: int = 1) -> None:
         # Chain stored as a list of Block objects; index 0 is the genesis block.
         self.chain: List[Block] = []
         # Difficulty for the simple proof-of-work algorithm (number of leading zeros)
         self.difficulty = max(0, int(difficulty))
+        # Number of processes used by proof_of_work
+        self.workers = max(1, int(workers))
         # Create the genesis block on initialization for convenience
         self.create_genesis_block()
 
@@ -105,11 +183,13 @@ class Blockchain:
         """Create and append the genesis (first) block of the chain.
 
         The genesis block has index 0, previous_hash set to '0', and an empty
-        transaction list. We compute its hash using the same mining procedure
-        to keep behavior consistent.
+        transaction list. Its hash is mined with the same proof-of-work
+        rules as any other block, but only once per difficulty per process:
+        later chains reuse the cached timestamp, nonce and hash.
         """
-        genesis = Block(index=0, timestamp=time.time(), transactions=[], previous_hash="0")
-        genesis.hash = self.proof_of_work(genesis)
+        timestamp, nonce, genesis_hash = _genesis_fields(self.difficulty)
+        genesis = Block(index=0, timestamp=timestamp, transactions=[], previous_hash="0",
+                        nonce=nonce, hash=genesis_hash)
         self.chain.append(genesis)
         return genesis
 
@@ -147,17 +227,27 @@ class Blockchain:
         Note: transactions must be JSON-serializable objects for deterministic
         hashing. In this educational implementation we assume they are.
         """
-        # Construct a dictionary of block content in a stable order
-        block_content = {
-            "index": block.index,
-            "timestamp": block.timestamp,
-            "transactions": block.transactions,
-            "previous_hash": block.previous_hash,
-            "nonce": block.nonce,
-        }
-        # Deterministic serialization
-        block_string = json.dumps(block_content, sort_keys=True).encode("utf-8")
-        return hashlib.sha256(block_string).hexdigest()
+        head, tail = self._hash_parts(block)
+        return hashlib.sha256(head + str(block.nonce).encode("utf-8") + tail).hexdigest()
+
+    @staticmethod
+    def _hash_parts(block: Block) -> Tuple[bytes, bytes]:
+        """Split the canonical block serialization around the nonce.
+
+        The bytes are identical to ``json.dumps(content, sort_keys=True)`` of
+        the block content. With sorted keys the nonce is the second field, so
+        everything except the nonce digits can be serialized once and reused
+        for every mining attempt instead of re-encoding the transactions each
+        time.
+        """
+        head = '{"index": ' + json.dumps(block.index) + ', "nonce": '
+        tail = (
+            ', "previous_hash": ' + json.dumps(block.previous_hash)
+            + ', "timestamp": ' + json.dumps(block.timestamp)
+            + ', "transactions": ' + json.dumps(block.transactions, sort_keys=True)
+            + "}"
+        )
+        return head.encode("utf-8"), tail.encode("utf-8")
 
     def proof_of_work(self, block: Block) -> str:
         """Simple proof-of-work algorithm: increment the nonce until the resulting
@@ -172,13 +262,43 @@ class Blockchain:
         """
         assert isinstance(block.nonce, int), "block.nonce must be an integer"
         prefix = "0" * self.difficulty
+        head, tail = self._hash_parts(block)
+        if self.workers > 1:
+            return self._parallel_proof_of_work(block, head, tail, prefix)
+        # Hash state after the constant head; each attempt resumes from a copy
+        base = hashlib.sha256(head)
         # Try successive nonces until we find a hash with required prefix
         while True:
-            computed_hash = self.compute_hash(block)
+            h = base.copy()
+            h.update(str(block.nonce).encode("utf-8"))
+            h.update(tail)
+            computed_hash = h.hexdigest()
             if computed_hash.startswith(prefix):
                 return computed_hash
             block.nonce += 1
 
+    def _parallel_proof_of_work(self, block: Block, head: bytes, tail: bytes, prefix: str) -> str:
+        """Search for a nonce using `self.workers` processes.
+
+        Nonces are scanned in rounds. In each round worker ``k`` checks every
+        ``workers``-th nonce of the round's window starting at offset ``k``,
+        so together the workers cover the whole window. The smallest hit of
+        the round wins, which yields exactly the nonce a sequential search
+        would have found.
+        """
+        workers = self.workers
+        window = workers * _NONCES_PER_WORKER
+        start = block.nonce
+        with multiprocessing.Pool(workers) as pool:
+            while True:
+                stop = start + window
+                jobs = [(head, tail, prefix, start + k, stop, workers) for k in range(workers)]
+                hits = [hit for hit in pool.map(_scan_nonces, jobs) if hit is not None]
+                if hits:
+                    block.nonce, computed_hash = min(hits)
+                    return computed_hash
+                start = stop
+
     # ---------------- Chain validation ----------------
     def is_chain_valid(self) -> Tuple[bool, str]:
         """Validate the blockchain integrity.
@@ -241,18 +361,27 @@ class Blockchain:
         return result
 
     @classmethod
-    def from_dict(cls, chain_data: List[Dict[str, Any]], difficulty: int = 2) -> "Blockchain":
+    def from_dict(cls, chain_data: List[Dict[str, Any]], difficulty: int = 2, workers: int = 1,
+                  trusted: bool = False) -> "Blockchain":
         """Create a Blockchain from a list of block dictionaries.
 
         This performs minimal validation (loads blocks into chain). Use
         `is_chain_valid()` to verify integrity after loading.
+
+        Pass ``trusted=True`` for data expected to come from `to_dict` to skip
+        the per-field coercion of `Block.from_dict`. Blocks missing a field
+        (or that are not dicts) are still loaded with `Block.from_dict`, so
+        hand-edited input loads as before and fails `is_chain_valid()`.
         """
-        bc = cls(difficulty=difficulty)
-        # Replace genesis block with the first item if provided
-        bc.chain = []
-        for bdata in chain_data:
-            block = Block.from_dict(bdata)
-            bc.chain.append(block)
+        bc = cls(difficulty=difficulty, workers=workers)
+        # Replace genesis block with the loaded blocks
+        if trusted:
+            try:
+                bc.chain = [Block.from_dict_trusted(bdata) for bdata in chain_data]
+                return bc
+            except (KeyError, TypeError):
+                pass
+        bc.chain = [Block.from_dict(bdata) for bdata in chain_data]
         return bc
 
 
@@ -9,11 +9,9 @@ for validation and serialization.
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 
-@dataclass
 class Node:
     """Represents a participant node in the distributed OS simulation.
 
@@ -22,24 +20,49 @@ class Node:
         quotas: Per-resource quotas (e.g., {'CPU': 4.0, 'Storage': 10.0})
         allocated: Current per-resource allocations (same keys as quotas)
         status: Simple status flag such as 'active' or 'inactive'
-    """
-
-    node_id: str
-    quotas: Dict[str, float] = field(default_factory=dict)
-    allocated: Dict[str, float] = field(default_factory=dict)
-    status: str = "active"
 
-    def __post_init__(self):
-        # Normalize quotas and allocated so keys match and values are floats
-        for k, v in list(self.quotas.items()):
-            try:
-                self.quotas[k] = float(v)
-            except Exception:
-                raise ValueError(f"Quota for {k} must be numeric")
+    The class declares ``__slots__`` so instances carry no per-instance
+    ``__dict__``. It is written out by hand rather than as a dataclass
+    because ``@dataclass(slots=True)`` needs Python 3.10; the constructor,
+    ``repr`` and equality match what the dataclass generated before.
+    """
 
-        # Initialize allocated keys to mirror quotas (default 0)
-        for k in list(self.quotas.keys()):
-            self.allocated.setdefault(k, 0.0)
+    __slots__ = ("node_id", "quotas", "allocated", "status")
+
+    def __init__(self, node_id: str, quotas: Optional[Dict[str, float]] = None,
+                 allocated: Optional[Dict[str, float]] = None, status: str = "active") -> None:
+        self.node_id = node_id
+        self.status = status
+        quotas = quotas if quotas is not None else {}
+        allocated = allocated if allocated is not None else {}
+
+        # Normalize quotas to floats in a single pass
+        try:
+            self.quotas = {k: float(v) for k, v in quotas.items()}
+        except (TypeError, ValueError):
+            # Slow path only on bad input: find the offending key for the message
+            for k, v in quotas.items():
+                try:
+                    float(v)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Quota for {k} must be numeric") from None
+            raise
+
+        # Initialize allocated keys to mirror quotas (default 0), keeping existing values
+        self.allocated = {**dict.fromkeys(self.quotas, 0.0), **allocated}
+
+    def __repr__(self) -> str:
+        return (f"Node(node_id={self.node_id!r}, quotas={self.quotas!r}, "
+                f"allocated={self.allocated!r}, status={self.status!r})")
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return ((self.node_id, self.quotas, self.allocated, self.status)
+                == (other.node_id, other.quotas, other.allocated, other.status))
+
+    # Mutable and compared by value, like the former dataclass: not hashable
+    __hash__ = None  # type: ignore[assignment]
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize the node to a dictionary for logging or transport."""
@@ -67,48 +90,51 @@ class Node:
         """Return True if `amount` of `resource` can be allocated without
         exceeding the node's quota.
         """
-        if resource not in self.quotas:
+        quota = self.quotas.get(resource)
+        if quota is None or amount < 0:
             return False
-        if amount < 0:
-            return False
-        return (self.allocated.get(resource, 0.0) + amount) <= self.quotas[resource]
+        return (self.allocated.get(resource, 0.0) + amount) <= quota
 
     def allocate(self, resource: str, amount: float) -> None:
         """Apply allocation to this node. Caller should validate first.
 
         Raises ValueError if allocation would exceed quota or if resource unknown.
         """
-        if resource not in self.quotas:
-            raise ValueError(f"Unknown resource: {resource}")
+        try:
+            quota = self.quotas[resource]
+        except KeyError:
+            raise ValueError(f"Unknown resource: {resource}") from None
         if amount < 0:
             raise ValueError("Amount must be positive")
-        if not self.can_allocate(resource, amount):
+        # Read the current allocation once and write the new total once
+        new_total = self.allocated.get(resource, 0.0) + amount
+        if new_total > quota:
             raise ValueError(f"Allocation would exceed quota for {resource}")
-        self.allocated[resource] = self.allocated.get(resource, 0.0) + amount
+        self.allocated[resource] = new_total
 
     def can_release(self, resource: str, amount: float) -> bool:
         """Return True if `amount` of `resource` can be released (i.e., allocated >= amount)."""
-        if resource not in self.allocated:
-            return False
-        if amount < 0:
+        current = self.allocated.get(resource)
+        if current is None or amount < 0:
             return False
-        return self.allocated.get(resource, 0.0) >= amount
+        return current >= amount
 
     def release(self, resource: str, amount: float) -> None:
         """Release an allocated resource from this node. Caller should validate first.
 
         Raises ValueError if release amount is invalid.
         """
-        if resource not in self.allocated:
-            raise ValueError(f"Unknown resource: {resource}")
+        try:
+            current = self.allocated[resource]
+        except KeyError:
+            raise ValueError(f"Unknown resource: {resource}") from None
         if amount < 0:
             raise ValueError("Amount must be positive")
-        if not self.can_release(resource, amount):
-            raise ValueError(f"Cannot release {amount} {resource}; only {self.allocated.get(resource,0)} allocated")
-        self.allocated[resource] = self.allocated.get(resource, 0.0) - amount
+        if current < amount:
+            raise ValueError(f"Cannot release {amount} {resource}; only {current} allocated")
+        remaining = current - amount
         # Normalize tiny float negatives to zero
-        if self.allocated[resource] < 1e-12:
-            self.allocated[resource] = 0.0
+        self.allocated[resource] = remaining if remaining >= 1e-12 else 0.0
 
     def __str__(self) -> str:
         return f"Node(id={self.node_id}, status={self.status})"
@@ -11,6 +11,7 @@ Usage:
 """
 
 import socket
+import struct
 import json
 import time
 
@@ -41,11 +42,22 @@ class BlockchainOSClient:
         request = json.dumps({"command": command})
         self.sock.sendall(request.encode('utf-8'))
 
-        response_data = self.sock.recv(4096)
-        response = json.loads(response_data.decode('utf-8'))
+        # Responses are length-prefixed: 4-byte big-endian size, then JSON
+        (length,) = struct.unpack(">I", self._recv_exactly(4))
+        response = json.loads(self._recv_exactly(length).decode('utf-8'))
 
         return response
 
+    def _recv_exactly(self, n):
+        """Read exactly n bytes from the socket."""
+        buf = bytearray()
+        while len(buf) < n:
+            chunk = self.sock.recv(n - len(buf))
+            if not chunk:
+                raise ConnectionError("Connection closed by controller")
+            buf += chunk
+        return bytes(buf)
+
     def print_response(self, response):
         """Pretty print a response."""
         if response['success']:
@@ -6,7 +6,7 @@ All important system events are logged with timestamps, node IDs,
 actions, and outcomes for accountability and debugging.
 """
 
-from .audit_logger import log_event, print_audit_log, get_events, set_events
+from .audit_logger import log_event, log_events_bulk, print_audit_log, get_events, set_events, set_max_events
 
-__all__ = ['log_event', 'print_audit_log', 'get_events', 'set_events']
+__all__ = ['log_event', 'log_events_bulk', 'print_audit_log', 'get_events', 'set_events', 'set_max_events']
 
@@ -4,15 +4,27 @@ Audit logger for the distributed OS demo.
 This lightweight logger stores events in-memory for easy printing and for
 inclusion in the blockchain audit trail. Each event includes a timestamp,
 node_id (optional), action and outcome.
+
+Events are kept in full by default because they are persisted as the audit
+trail. Long-running processes can cap memory with `set_max_events`, after
+which the oldest events are dropped as new ones arrive.
 """
 
 from __future__ import annotations
 
-from typing import List, Dict, Any
+from collections import deque
+from itertools import islice
+from typing import Deque, List, Dict, Any, Iterable, Optional, Tuple
+import sys
 import time
 
 
-_events: List[Dict[str, Any]] = []
+_events: Deque[Dict[str, Any]] = deque()
+# Rendered print_audit_log lines for the newest len(_rendered) events; extended lazily
+_rendered: Deque[str] = deque()
+# Events appended since the last reset, and how many of those were rendered
+_logged = 0
+_rendered_upto = 0
 
 
 def log_event(node_id: str, action: str, outcome: str, details: Dict[str, Any] = None) -> None:
@@ -24,14 +36,40 @@ def log_event(node_id: str, action: str, outcome: str, details: Dict[str, Any] =
         outcome: human-readable outcome or status e.g. 'accepted' or 'rejected'
         details: optional dictionary with extra context
     """
-    event = {
+    # node_id/action/outcome repeat across events; interning shares one object each
+    event = _intern_fields({
         'timestamp': time.time(),
         'node_id': node_id,
         'action': action,
         'outcome': outcome,
         'details': details or {}
-    }
+    })
+    global _logged
     _events.append(event)
+    _logged += 1
+
+
+def log_events_bulk(events: Iterable[Tuple[str, str, str, Optional[Dict[str, Any]]]]) -> None:
+    """Record several events at once.
+
+    Each item is a ``(node_id, action, outcome, details)`` tuple with the same
+    meaning as the arguments of `log_event`. The clock is read once for the
+    whole batch, so every event in it shares the same timestamp.
+    """
+    global _logged
+    ts = time.time()
+    batch = [
+        _intern_fields({
+            'timestamp': ts,
+            'node_id': node_id,
+            'action': action,
+            'outcome': outcome,
+            'details': details or {}
+        })
+        for node_id, action, outcome, details in events
+    ]
+    _events.extend(batch)
+    _logged += len(batch)
 
 
 def get_events() -> List[Dict[str, Any]]:
@@ -40,29 +78,68 @@ def get_events() -> List[Dict[str, Any]]:
 
 
 def set_events(events: List[Dict[str, Any]]) -> None:
-    """Replace the in-memory events with the provided list (used when loading state)."""
-    global _events
-    _events = list(events)
+    """Replace the in-memory events with the provided list (used when loading state).
+
+    String fields of loaded events are interned, since the JSON decoder
+    creates a fresh string object for every occurrence. If a cap is set,
+    only the newest events that fit are kept.
+    """
+    _reset((_intern_fields(ev) for ev in events), _events.maxlen)
+
+
+def set_max_events(max_events: Optional[int]) -> None:
+    """Cap the number of in-memory events (None removes the cap).
+
+    Once the cap is reached each new event evicts the oldest one in O(1).
+    Existing events beyond the new cap are dropped, oldest first.
+    """
+    if max_events is not None and max_events < 1:
+        raise ValueError("max_events must be a positive integer or None")
+    _reset(_events, max_events)
+
+
+def _reset(events: Iterable[Dict[str, Any]], maxlen: Optional[int]) -> None:
+    """Replace the event store with `events` under the given cap."""
+    global _events, _rendered, _logged, _rendered_upto
+    _events = deque(events, maxlen=maxlen)
+    _rendered = deque(maxlen=maxlen)
+    _logged = len(_events)
+    _rendered_upto = 0
+
+
+def _intern_fields(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Intern the repeated string fields of an event dict in place.
+
+    Non-string values (e.g. a None node_id) are left as they are.
+    """
+    for key in ('node_id', 'action', 'outcome'):
+        value = event.get(key)
+        if type(value) is str:
+            event[key] = sys.intern(value)
+    return event
 
 
 def print_audit_log() -> None:
     """Print events in a readable audit trail format."""
+    global _rendered_upto
     if not _events:
         print("(no audit events recorded)")
         return
 
-    print("\n== Audit Log ==")
-    for ev in _events:
-        ts = ev['timestamp']
-        nid = ev['node_id']
-        action = ev['action']
-        outcome = ev['outcome']
-        details = ev['details']
-        print(f"[{ts:.3f}] node={nid} action={action} outcome={outcome} details={details}")
-    print("== End Audit Log ==\n")
+    # Only events logged since the last print need rendering; _rendered shares
+    # the event cap, so lines of evicted events fall out of it in step
+    pending = min(_logged - _rendered_upto, len(_events))
+    _rendered.extend(_render_event(ev) for ev in islice(_events, len(_events) - pending, None))
+    _rendered_upto = _logged
+    sys.stdout.write("\n== Audit Log ==\n" + "\n".join(_rendered) + "\n== End Audit Log ==\n\n")
+
+
+def _render_event(ev: Dict[str, Any]) -> str:
+    """Format one event as a print_audit_log line."""
+    return (f"[{ev['timestamp']:.3f}] node={ev['node_id']} action={ev['action']} "
+            f"outcome={ev['outcome']} details={ev['details']}")
 
 
 def clear_events() -> None:
     """Clear in-memory audit events."""
-    global _events
-    _events = []
+    _reset((), _events.maxlen)
@@ -8,38 +8,149 @@ Saves and loads a single JSON file containing:
 - checksum: SHA-256 hash of the data to detect tampering
 
 Implements atomic writes by writing to a temporary file first, then renaming.
-This ensures state is never corrupted if the process crashes mid-write.
+The temp file and its directory are fsynced, so state is never corrupted or
+lost if the process or machine crashes mid-write. The fsyncs can be relaxed
+with the `durability` argument of `save_state` (e.g. in tests, where the
+state directory is thrown away anyway).
 
 The checksum provides an additional layer of tamper detection: if someone
 manually edits the JSON file, the checksum won't match and we can detect
 unauthorized modifications.
+
+Large state files can optionally be zlib-compressed (see COMPRESS_ABOVE).
+This is off by default so the file stays plain JSON that can be inspected
+and edited by hand, as the tamper-detection demos do. Compressed files are
+recognised by a magic prefix and load transparently either way.
+
+The last state written by this process is remembered along with the size
+and SHA-256 digest of its file. Loading that file again (e.g. a controller
+restarted in the same process, or validate_chain right after a command) only
+hashes the file's bytes and skips parsing and re-verifying it; any edit
+changes the digest.
 """
 
 from __future__ import annotations
 
 import json
+import math
+import mmap
 import os
 import tempfile
 import hashlib
-from typing import Dict, Any, List, Tuple
+import zlib
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from pathlib import Path
 
+try:  # optional C-accelerated encoder; the standard library is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
 
 DEFAULT_STATE_FILE = Path("system_state.json")
 
+# Durability levels for save_state:
+#   "full" - fsync the temp file and, after the rename, its directory
+#   "data" - fsync the temp file only
+#   "none" - no fsync; the write is still atomic against process crashes
+DURABILITY_LEVELS = ("full", "data", "none")
+DEFAULT_DURABILITY = "full"
+
+# Compress state files whose JSON encoding exceeds this many bytes (e.g.
+# 64 * 1024) with zlib level 1; None writes plain JSON regardless of size
+COMPRESS_ABOVE: Optional[int] = None
+# Prefix marking a compressed state file; JSON text can never start with it
+_COMPRESSED_MAGIC = b"BOSZ"
+
+# (path, file size, SHA-256 of the file, payload) of the last state file
+# written by save_state
+_last_saved: Optional[Tuple[str, int, bytes, Dict[str, Any]]] = None
+
 
-def compute_data_checksum(nodes: List[Dict[str, Any]], chain: List[Dict[str, Any]], audit_events: List[Dict[str, Any]]) -> str:
+def _dumps_state(payload: Dict[str, Any]) -> bytes:
+    """Encode the state file payload to UTF-8 JSON bytes.
+
+    Uses orjson (indented, so the file stays readable) when it is installed,
+    otherwise compact stdlib JSON: ``indent`` would force the stdlib onto its
+    pure-Python encoder.
+
+    The stdlib is also used for payloads orjson can't encode the way the
+    checksum (computed with the stdlib) sees them: orjson rejects non-string
+    dict keys and integers beyond 64 bits, and writes non-finite floats
+    (e.g. an ``inf`` quota) as ``null`` where the stdlib writes
+    ``Infinity``/``NaN``.
+    """
+    if orjson is not None:
+        try:
+            data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            # Only output with a null can hold a non-finite float
+            if b"null" not in data or not _has_non_finite(payload):
+                return data
+    return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Return True if `obj` (nested dicts/lists) contains an inf or NaN float."""
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, dict):
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+        elif isinstance(obj, float) and not math.isfinite(obj):
+            return True
+    return False
+
+
+def compute_data_checksum(nodes: List[Dict[str, Any]], chain: List[Dict[str, Any]], audit_events: List[Dict[str, Any]],
+                          *, chain_json: Optional[List[bytes]] = None) -> str:
     """Compute SHA-256 checksum of the system state data.
 
     This provides tamper detection: if someone manually edits the JSON file,
     the checksum won't match and we can detect unauthorized modifications.
+
+    The digest is over the same bytes as ``json.dumps({...}, sort_keys=True)``
+    of the three lists, but each list item is encoded and fed to the hash on
+    its own, so the full state string is never built in memory.
+
+    `chain_json` optionally supplies the canonical encoding of each chain
+    item (e.g. from `Block.canonical_json`), which is hashed as-is instead
+    of re-encoding `chain`.
     """
-    data_string = json.dumps({
-        "nodes": nodes,
-        "chain": chain,
-        "audit_events": audit_events
-    }, sort_keys=True)
-    return hashlib.sha256(data_string.encode('utf-8')).hexdigest()
+    h = hashlib.sha256()
+    # Top-level keys in sorted order, exactly as sort_keys would emit them
+    h.update(b'{"audit_events": ')
+    _hash_json_list(h, audit_events)
+    h.update(b', "chain": ')
+    if chain_json is not None:
+        _hash_encoded_list(h, chain_json)
+    else:
+        _hash_json_list(h, chain)
+    h.update(b', "nodes": ')
+    _hash_json_list(h, nodes)
+    h.update(b"}")
+    return h.hexdigest()
+
+
+def _hash_json_list(h: Any, items: List[Any]) -> None:
+    """Feed the canonical ``json.dumps(items, sort_keys=True)`` bytes to `h` item by item."""
+    _hash_encoded_list(h, (json.dumps(item, sort_keys=True).encode("utf-8") for item in items))
+
+
+def _hash_encoded_list(h: Any, encoded: Iterable[bytes]) -> None:
+    """Feed a JSON list of already-encoded items to `h`, with json.dumps separators."""
+    h.update(b"[")
+    first = True
+    for item in encoded:
+        if not first:
+            h.update(b", ")
+        h.update(item)
+        first = False
+    h.update(b"]")
 
 
 def verify_data_integrity(data: Dict[str, Any]) -> Tuple[bool, str]:
@@ -63,16 +174,26 @@ def verify_data_integrity(data: Dict[str, Any]) -> Tuple[bool, str]:
     return True, "Integrity verified"
 
 
-def save_state(file_path: Path = DEFAULT_STATE_FILE, *, nodes: List[Dict[str, Any]], chain: List[Dict[str, Any]], audit_events: List[Dict[str, Any]]) -> None:
+def save_state(file_path: Path = DEFAULT_STATE_FILE, *, nodes: List[Dict[str, Any]], chain: List[Dict[str, Any]], audit_events: List[Dict[str, Any]],
+               durability: Optional[str] = None, chain_json: Optional[List[bytes]] = None) -> None:
     """Save system state to JSON file atomically.
 
     Uses atomic write pattern: write to temp file, then rename.
     This prevents corruption if interrupted.
 
+    `durability` is one of DURABILITY_LEVELS and defaults to the module's
+    DEFAULT_DURABILITY ("full"). `chain_json` is passed on to
+    `compute_data_checksum` and must match `chain` item for item.
+
     Also computes and stores a checksum to detect manual tampering.
     """
+    if durability is None:
+        durability = DEFAULT_DURABILITY
+    if durability not in DURABILITY_LEVELS:
+        raise ValueError(f"durability must be one of {DURABILITY_LEVELS}, got {durability!r}")
+
     # Compute checksum of the data
-    checksum = compute_data_checksum(nodes, chain, audit_events)
+    checksum = compute_data_checksum(nodes, chain, audit_events, chain_json=chain_json)
 
     payload = {
         "nodes": nodes,
@@ -85,13 +206,26 @@ def save_state(file_path: Path = DEFAULT_STATE_FILE, *, nodes: List[Dict[str, An
     dir_path = file_path.parent
     dir_path.mkdir(parents=True, exist_ok=True)
 
+    data = _dumps_state(payload)
+    if COMPRESS_ABOVE is not None and len(data) > COMPRESS_ABOVE:
+        # Level 1 is much faster than the default and compresses JSON nearly as well
+        data = _COMPRESSED_MAGIC + zlib.compress(data, 1)
+
     # Create temp file in same directory to ensure atomic rename works
     fd, temp_path = tempfile.mkstemp(dir=dir_path, prefix=".tmp_state_", suffix=".json")
     try:
-        with os.fdopen(fd, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2)
+        try:
+            # The payload is already bytes; write it straight to the descriptor
+            _write_all(fd, data)
+            # Make the bytes durable before the rename can expose them
+            if durability != "none":
+                os.fsync(fd)
+        finally:
+            os.close(fd)
         # Atomic rename (overwrites target on POSIX systems)
         os.replace(temp_path, file_path)
+        if durability == "full":
+            _fsync_dir(dir_path)
     except Exception:
         # Clean up temp file on error
         try:
@@ -100,6 +234,98 @@ def save_state(file_path: Path = DEFAULT_STATE_FILE, *, nodes: List[Dict[str, An
             pass
         raise
 
+    # Snapshot the items so later changes by the caller don't leak into the cache
+    global _last_saved
+    snapshot = {key: _copy_items(payload[key]) for key in ("nodes", "chain", "audit_events")}
+    snapshot["checksum"] = checksum
+    _last_saved = (os.fspath(file_path), len(data), hashlib.sha256(data).digest(), snapshot)
+
+
+def _copy_items(items: List[Any]) -> List[Any]:
+    """Copy a list of state items, and each dict in it, one level deep."""
+    return [dict(item) if isinstance(item, dict) else item for item in items]
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    """Write all of `data` to a raw file descriptor, retrying short writes."""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _fsync_dir(dir_path: Path) -> None:
+    """Flush a directory entry so a completed rename survives a crash.
+
+    Directories cannot be opened for syncing on some platforms (e.g.
+    Windows); there the rename is already as durable as it can be made.
+    """
+    try:
+        dir_fd = os.open(dir_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+def _read_state_file(file_path: Path, *, use_orjson: bool = True) -> Dict[str, Any]:
+    """Parse a state file, plain or compressed.
+
+    The file is memory-mapped and parsed (or decompressed) straight from the
+    mapping, so no intermediate copy of the whole file is made. Without
+    orjson (or with `use_orjson` false), plain files are read once and
+    handed to the stdlib parser.
+    """
+    with open(file_path, "rb") as f:
+        # mmap cannot map an empty file; let the parser report that case
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                if view[:len(_COMPRESSED_MAGIC)] == _COMPRESSED_MAGIC:
+                    return _loads_state(zlib.decompress(view[len(_COMPRESSED_MAGIC):]), use_orjson=use_orjson)
+                if orjson is not None and use_orjson:
+                    return _loads_state(view)
+        return json.loads(f.read())
+
+
+def _parse_state_bytes(raw: bytes) -> Dict[str, Any]:
+    """Parse the full contents of a state file, plain or compressed."""
+    if raw.startswith(_COMPRESSED_MAGIC):
+        raw = zlib.decompress(raw[len(_COMPRESSED_MAGIC):])
+    return _loads_state(raw)
+
+
+def _loads_state(raw: Any, *, use_orjson: bool = True) -> Dict[str, Any]:
+    """Parse UTF-8 JSON bytes (or a buffer of them) with orjson if available.
+
+    orjson rejects the ``Infinity``/``NaN`` tokens the stdlib writes for
+    non-finite floats, so on a decode error the stdlib parser gets a try
+    before the error is reported.
+    """
+    if orjson is not None and use_orjson:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(bytes(raw))
+
+
+def _read_unless_saved(file_path: Path, size: int, digest: bytes) -> Optional[Dict[str, Any]]:
+    """Parse a state file, or return None if its size and SHA-256 match.
+
+    Hashing the bytes is far cheaper than parsing the file and recomputing
+    its checksum, and unlike a stat-based check it cannot miss an edit that
+    keeps the size and lands within the filesystem's timestamp granularity.
+    """
+    with open(file_path, "rb") as f:
+        raw = f.read()
+    if len(raw) == size and hashlib.sha256(raw).digest() == digest:
+        return None
+    return _parse_state_bytes(raw)
+
 
 def load_state(file_path: Path = DEFAULT_STATE_FILE) -> Dict[str, Any]:
     """Load system state from JSON file.
@@ -107,15 +333,38 @@ def load_state(file_path: Path = DEFAULT_STATE_FILE) -> Dict[str, Any]:
     Returns empty state if file doesn't exist.
 
     Verifies the checksum to detect if the file has been manually tampered with.
+
+    If the file still holds exactly the bytes this process last saved to it,
+    the saved state is returned without parsing it. The lists and the dicts
+    in them are fresh copies; values nested deeper (e.g. a node's quotas)
+    are shared with what was passed to save_state.
     """
     if not file_path.exists():
         return {"nodes": [], "chain": [], "audit_events": [], "checksum": None, "integrity_ok": True}
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    cached = _last_saved
+    if cached is not None and cached[0] == os.fspath(file_path):
+        data = _read_unless_saved(file_path, cached[1], cached[2])
+        if data is None:
+            saved = cached[3]
+            return {
+                "nodes": _copy_items(saved["nodes"]),
+                "chain": _copy_items(saved["chain"]),
+                "audit_events": _copy_items(saved["audit_events"]),
+                "checksum": saved["checksum"],
+                "integrity_ok": True,
+                "integrity_msg": "Integrity verified",
+            }
+    else:
+        data = _read_state_file(file_path)
 
     # Verify integrity
     integrity_ok, integrity_msg = verify_data_integrity(data)
+    if not integrity_ok and orjson is not None:
+        # orjson parses integers beyond 64 bits as floats, which changes the
+        # checksum; only report a mismatch the stdlib parser agrees with
+        data = _read_state_file(file_path, use_orjson=False)
+        integrity_ok, integrity_msg = verify_data_integrity(data)
 
     return {
         "nodes": data.get("nodes", []),
@@ -8,7 +8,8 @@ and updates allocations only when instructed (e.g., after consensus).
 
 from __future__ import annotations
 
-from typing import Dict, Any
+import sys
+from typing import Dict, Any, Optional
 from core.node import Node
 
 
@@ -30,9 +31,20 @@ class ResourceManager:
 
     def register_node(self, node: Node) -> None:
         """Add a node to resource manager registry."""
-        if node.node_id in self.nodes:
-            raise ValueError(f"Node {node.node_id} already registered")
-        self.nodes[node.node_id] = node
+        node_id = node.node_id
+        if isinstance(node_id, str):
+            # Intern the id so registry keys and later lookups share one string object
+            node.node_id = node_id = sys.intern(node_id)
+        if node_id in self.nodes:
+            raise ValueError(f"Node {node_id} already registered")
+        self.nodes[node_id] = node
+
+    def _get_node(self, node_id: str) -> Node:
+        """Return the registered node with a single lookup, or raise ValueError."""
+        node = self.nodes.get(node_id)
+        if node is None:
+            raise ValueError(f"Unknown node: {node_id}")
+        return node
 
     def can_allocate(self, node_id: str, resource: str, amount: float) -> bool:
         """Check if a node can allocate the requested resource now.
@@ -40,31 +52,32 @@ class ResourceManager:
         This checks node-specific quotas and the global capacity when
         appropriate.
         """
-        if node_id not in self.nodes:
-            raise ValueError(f"Unknown node: {node_id}")
-        node = self.nodes[node_id]
+        node = self._get_node(node_id)
         # Basic per-node quota check
         return node.can_allocate(resource, amount)
 
     def apply_allocation(self, node_id: str, resource: str, amount: float) -> None:
         """Apply allocation to a node. Caller must ensure consensus already accepted the block."""
-        if node_id not in self.nodes:
-            raise ValueError(f"Unknown node: {node_id}")
-        node = self.nodes[node_id]
+        node = self._get_node(node_id)
         node.allocate(resource, amount)
 
     def apply_release(self, node_id: str, resource: str, amount: float) -> None:
         """Apply release of resources for a node. Caller must ensure consensus accepted."""
-        if node_id not in self.nodes:
-            raise ValueError(f"Unknown node: {node_id}")
-        node = self.nodes[node_id]
+        node = self._get_node(node_id)
         node.release(resource, amount)
 
+    def get_node_status(self, node_id: str) -> Optional[Dict[str, Any]]:
+        """Return the serialized state of one node, or None if it is unknown.
+
+        Equivalent to ``get_status()['nodes'].get(node_id)`` without
+        serializing every other registered node.
+        """
+        node = self.nodes.get(node_id)
+        return node.to_dict() if node is not None else None
+
     def get_status(self) -> Dict[str, Any]:
         """Return summary of registered nodes and their allocations."""
-        summary = {}
-        for nid, node in self.nodes.items():
-            summary[nid] = node.to_dict()
+        summary = {nid: node.to_dict() for nid, node in self.nodes.items()}
         return {
             'global_cpu': self.global_cpu,
             'global_storage': self.global_storage,
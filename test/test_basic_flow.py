@@ -4,39 +4,51 @@ Basic integration tests for validating system flow.
 These tests verify that the main components work together correctly.
 """
 
-import tempfile
-from pathlib import Path
 from cli.cli import IntegratedCLI
 
 
-def test_basic_node_creation():
+def test_basic_node_creation(tmp_path):
     """Test that we can create a node and it's registered."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        state_file = str(Path(tmpdir) / "test_state.json")
-        cli = IntegratedCLI(difficulty=1, state_file=state_file)
-        result = cli.add_node('test_node', {'CPU': 4.0, 'Memory': 8.0})
-        assert 'test_node' in result
-        assert 'test_node' in cli.resource_manager.nodes
+    state_file = str(tmp_path / "test_state.json")
+    cli = IntegratedCLI(difficulty=1, state_file=state_file)
+    result = cli.add_node('test_node', {'CPU': 4.0, 'Memory': 8.0})
+    assert 'test_node' in result
+    assert 'test_node' in cli.resource_manager.nodes
 
 
-def test_end_to_end_allocation_flow():
+def test_end_to_end_allocation_flow(tmp_path):
     """Test complete flow: create nodes, allocate, validate chain."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        state_file = str(Path(tmpdir) / "test_state.json")
-        cli = IntegratedCLI(difficulty=1, state_file=state_file)
+    state_file = str(tmp_path / "test_state.json")
+    cli = IntegratedCLI(difficulty=1, state_file=state_file)
 
-        # Create nodes
-        cli.add_node('node1', {'CPU': 4.0})
-        cli.add_node('node2', {'CPU': 4.0})
+    # Create nodes
+    cli.add_node('node1', {'CPU': 4.0})
+    cli.add_node('node2', {'CPU': 4.0})
 
-        # Request resource (triggers consensus and blockchain update)
-        result = cli.request_resource('node1', 'CPU', 2.0)
-        assert 'block' in result.lower()
+    # Request resource (triggers consensus and blockchain update)
+    result = cli.request_resource('node1', 'CPU', 2.0)
+    assert 'block' in result.lower()
 
-        # Verify blockchain is valid
-        is_valid, reason = cli.validate_chain()
-        assert is_valid
+    # Verify blockchain is valid
+    is_valid, reason = cli.validate_chain()
+    assert is_valid
 
-        # Verify allocation was applied
-        node1 = cli.resource_manager.nodes['node1']
-        assert node1.allocated['CPU'] == 2.0
+    # Verify allocation was applied
+    node1 = cli.resource_manager.nodes['node1']
+    assert node1.allocated['CPU'] == 2.0
+
+
+def test_reset_returns_to_fresh_state(tmp_path):
+    """Test that reset() clears nodes, blocks and a stale tampering flag."""
+    state_file = str(tmp_path / "test_state.json")
+    cli = IntegratedCLI(difficulty=1, state_file=state_file)
+    cli.add_node('node1', {'CPU': 4.0})
+    cli.file_tampered = True
+    cli.tamper_message = "stale"
+
+    cli.reset()
+
+    assert cli.resource_manager.nodes == {}
+    assert len(cli.blockchain.chain) == 1
+    is_valid, reason = cli.validate_chain()
+    assert is_valid, reason
@@ -45,3 +45,139 @@ def test_resource_manager_allocation_and_release():
     assert node.allocated['CPU'] == 2
     rm.apply_release('n1', 'CPU', 1)
     assert node.allocated['CPU'] == 1
+
+
+def test_compute_hash_matches_canonical_json():
+    import hashlib
+    import json
+    bc = Blockchain(difficulty=1)
+    tx = Transaction(node_id='n1', resource_type='CPU', amount=1.5, transaction_type='allocate')
+    block = bc.create_block([tx.to_dict()])
+    content = {
+        "index": block.index,
+        "timestamp": block.timestamp,
+        "transactions": block.transactions,
+        "previous_hash": block.previous_hash,
+        "nonce": block.nonce,
+    }
+    expected = hashlib.sha256(json.dumps(content, sort_keys=True).encode("utf-8")).hexdigest()
+    assert bc.compute_hash(block) == expected
+    assert block.hash == expected
+
+
+def test_block_canonical_json_tracks_hash():
+    import json
+
+    bc = Blockchain(difficulty=1)
+    block = bc.create_block([{'node_id': 'n1', 'amount': 1}])
+    assert block.canonical_json() == json.dumps(block.to_dict(), sort_keys=True).encode('utf-8')
+
+    # Re-mining changes the hash, which invalidates the cached encoding
+    block.timestamp += 1
+    block.hash = bc.proof_of_work(block)
+    assert block.canonical_json() == json.dumps(block.to_dict(), sort_keys=True).encode('utf-8')
+
+    # So does editing the transactions in place, although the hash stays the same
+    block.transactions[0]['amount'] = 9999
+    assert block.canonical_json() == json.dumps(block.to_dict(), sort_keys=True).encode('utf-8')
+
+
+def test_parallel_proof_of_work_matches_sequential():
+    sequential = Blockchain(difficulty=2)
+    parallel = Blockchain(difficulty=2, workers=2)
+    a = Block(index=1, timestamp=1234.5, transactions=[{"node_id": "n1"}], previous_hash="abc")
+    b = Block(index=1, timestamp=1234.5, transactions=[{"node_id": "n1"}], previous_hash="abc")
+    assert parallel.proof_of_work(b) == sequential.proof_of_work(a)
+    assert a.nonce == b.nonce
+
+
+def test_consensus_quiet_mode_prints_nothing(capsys):
+    nodes = [Node(node_id='a', quotas={'CPU': 1}), Node(node_id='b', quotas={'CPU': 1})]
+    ce = ConsensusEngine(nodes, verbose=False)
+    block = Block(index=1, timestamp=0.0, transactions=[], previous_hash='0', hash='abc')
+    result, details = ce.request_consensus(block)
+    assert result
+    assert details['votes_for'] == 2
+    assert capsys.readouterr().out == ""
+
+
+def test_log_event_accepts_non_string_node_id():
+    from logger.audit_logger import log_event, get_events, clear_events
+
+    clear_events()
+    log_event(None, 'startup', 'ok')
+    assert get_events()[0]['node_id'] is None
+    clear_events()
+
+
+def _naive_audit_log(events):
+    lines = [f"[{ev['timestamp']:.3f}] node={ev['node_id']} action={ev['action']} "
+             f"outcome={ev['outcome']} details={ev['details']}" for ev in events]
+    return "\n== Audit Log ==\n" + "\n".join(lines) + "\n== End Audit Log ==\n\n"
+
+
+def test_audit_log_cap_and_render_cache(capsys):
+    from logger.audit_logger import (log_event, get_events, set_events, set_max_events,
+                                     clear_events, print_audit_log)
+
+    clear_events()
+    try:
+        set_max_events(3)
+        for i in range(5):
+            log_event(f'n{i}', 'act', 'ok', {'i': i})
+        # The cap keeps the newest events, oldest evicted first
+        assert [ev['node_id'] for ev in get_events()] == ['n2', 'n3', 'n4']
+
+        print_audit_log()
+        assert capsys.readouterr().out == _naive_audit_log(get_events())
+
+        # Events logged after a print evict cached lines in step
+        log_event('n5', 'act', 'ok')
+        log_event('n6', 'act', 'ok')
+        print_audit_log()
+        assert [ev['node_id'] for ev in get_events()] == ['n4', 'n5', 'n6']
+        assert capsys.readouterr().out == _naive_audit_log(get_events())
+
+        # Lowering the cap drops the oldest; removing it keeps what is there
+        set_max_events(2)
+        assert [ev['node_id'] for ev in get_events()] == ['n5', 'n6']
+        set_max_events(None)
+        for i in range(7, 10):
+            log_event(f'n{i}', 'act', 'ok')
+        assert len(get_events()) == 5
+        print_audit_log()
+        assert capsys.readouterr().out == _naive_audit_log(get_events())
+
+        # set_events replaces the store and the rendered lines
+        loaded = [{'timestamp': 1.0, 'node_id': 'x', 'action': 'load', 'outcome': 'ok', 'details': {}}]
+        set_events(loaded)
+        print_audit_log()
+        assert capsys.readouterr().out == _naive_audit_log(loaded)
+
+        clear_events()
+        print_audit_log()
+        assert capsys.readouterr().out == "(no audit events recorded)\n"
+    finally:
+        set_max_events(None)
+        clear_events()
+
+
+def test_log_events_bulk_shares_timestamp(capsys):
+    import sys
+    from logger.audit_logger import log_events_bulk, get_events, clear_events, print_audit_log
+
+    clear_events()
+    try:
+        node_id = ''.join(['bulk', '_node'])  # built at runtime, so not already interned
+        log_events_bulk([(node_id, 'request_resource', 'accepted', {'amount': 1}),
+                         (node_id, 'release_resource', 'accepted', None)])
+        events = get_events()
+        assert len(events) == 2
+        assert events[0]['timestamp'] == events[1]['timestamp']
+        assert events[0]['node_id'] is events[1]['node_id'] is sys.intern('bulk_node')
+        assert events[1]['details'] == {}
+
+        print_audit_log()
+        assert capsys.readouterr().out == _naive_audit_log(events)
+    finally:
+        clear_events()
@@ -10,14 +10,14 @@ These tests verify:
 
 import os
 import json
-import tempfile
+import hashlib
 import socket
-import time
+import struct
 from pathlib import Path
 
 import pytest
 
-from persistence import save_state, load_state
+from persistence import save_state, load_state, compute_data_checksum
 from controller import MainController
 from core.node import Node
 from core.blockchain import Blockchain
@@ -26,272 +26,524 @@ from core.blockchain import Blockchain
 class TestPersistence:
     """Test atomic persistence operations."""
 
-    def test_save_and_load_empty_state(self):
+    def test_save_and_load_empty_state(self, tmp_path):
         """Test saving and loading empty state."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state_file = Path(tmpdir) / "test_state.json"
+        state_file = tmp_path / "test_state.json"
 
-            # Save empty state
-            save_state(state_file, nodes=[], chain=[], audit_events=[])
+        # Save empty state
+        save_state(state_file, nodes=[], chain=[], audit_events=[])
 
-            # Verify file exists
-            assert state_file.exists()
+        # Verify file exists
+        assert state_file.exists()
 
-            # Load it back
-            data = load_state(state_file)
-            assert data["nodes"] == []
-            assert data["chain"] == []
-            assert data["audit_events"] == []
+        # Load it back
+        data = load_state(state_file)
+        assert data["nodes"] == []
+        assert data["chain"] == []
+        assert data["audit_events"] == []
 
-    def test_save_and_load_with_data(self):
+    def test_save_and_load_with_data(self, tmp_path):
         """Test saving and loading state with actual data."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state_file = Path(tmpdir) / "test_state.json"
-
-            # Create test data
-            nodes = [
-                {"node_id": "n1", "quotas": {"CPU": 4.0}, "allocated": {"CPU": 2.0}, "status": "active"},
-                {"node_id": "n2", "quotas": {"Memory": 8.0}, "allocated": {"Memory": 0.0}, "status": "active"},
-            ]
-            chain = [
-                {"index": 0, "timestamp": 1234.5, "transactions": [], "previous_hash": "0", "nonce": 0, "hash": "genesis"},
-            ]
-            audit_events = [
-                {"timestamp": 1234.5, "node_id": "n1", "action": "add_node", "outcome": "created", "details": {}},
-            ]
-
-            # Save state
-            save_state(state_file, nodes=nodes, chain=chain, audit_events=audit_events)
-
-            # Load it back
-            data = load_state(state_file)
-            assert len(data["nodes"]) == 2
-            assert data["nodes"][0]["node_id"] == "n1"
-            assert len(data["chain"]) == 1
-            assert len(data["audit_events"]) == 1
-
-    def test_load_nonexistent_file(self):
+        state_file = tmp_path / "test_state.json"
+
+        # Create test data
+        nodes = [
+            {"node_id": "n1", "quotas": {"CPU": 4.0}, "allocated": {"CPU": 2.0}, "status": "active"},
+            {"node_id": "n2", "quotas": {"Memory": 8.0}, "allocated": {"Memory": 0.0}, "status": "active"},
+        ]
+        chain = [
+            {"index": 0, "timestamp": 1234.5, "transactions": [], "previous_hash": "0", "nonce": 0, "hash": "genesis"},
+        ]
+        audit_events = [
+            {"timestamp": 1234.5, "node_id": "n1", "action": "add_node", "outcome": "created", "details": {}},
+        ]
+
+        # Save state
+        save_state(state_file, nodes=nodes, chain=chain, audit_events=audit_events)
+
+        # Load it back
+        data = load_state(state_file)
+        assert len(data["nodes"]) == 2
+        assert data["nodes"][0]["node_id"] == "n1"
+        assert len(data["chain"]) == 1
+        assert len(data["audit_events"]) == 1
+
+    def test_load_nonexistent_file(self, tmp_path):
         """Test loading from a file that doesn't exist returns empty state."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state_file = Path(tmpdir) / "nonexistent.json"
-            data = load_state(state_file)
-            assert data["nodes"] == []
-            assert data["chain"] == []
-            assert data["audit_events"] == []
-
-    def test_atomic_write_on_crash(self):
-        """Test that atomic write prevents corruption on simulated crash."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state_file = Path(tmpdir) / "test_state.json"
-
-            # Save initial state
-            save_state(state_file, nodes=[{"node_id": "n1"}], chain=[], audit_events=[])
-            initial_data = load_state(state_file)
+        state_file = tmp_path / "nonexistent.json"
+        data = load_state(state_file)
+        assert data["nodes"] == []
+        assert data["chain"] == []
+        assert data["audit_events"] == []
 
-            # Verify we can load it
-            assert len(initial_data["nodes"]) == 1
-
-            # The atomic write should have cleaned up any temp files
-            temp_files = list(Path(tmpdir).glob(".tmp_state_*"))
-            assert len(temp_files) == 0
+    def test_atomic_write_on_crash(self, tmp_path):
+        """Test that atomic write prevents corruption on simulated crash."""
+        state_file = tmp_path / "test_state.json"
+
+        # Save initial state
+        save_state(state_file, nodes=[{"node_id": "n1"}], chain=[], audit_events=[])
+        initial_data = load_state(state_file)
+
+        # Verify we can load it
+        assert len(initial_data["nodes"]) == 1
+
+        # The atomic write should have cleaned up any temp files
+        temp_files = [e.name for e in os.scandir(tmp_path) if e.name.startswith(".tmp_state_")]
+        assert temp_files == []
+
+
+    def test_reload_after_save_detects_edits(self, tmp_path):
+        """Test reloading a just-saved file still catches edits made since."""
+        state_file = tmp_path / "test_state.json"
+        nodes = [{"node_id": "n1", "quotas": {"CPU": 4.0}, "allocated": {"CPU": 2.0}, "status": "active"}]
+        save_state(state_file, nodes=nodes, chain=[], audit_events=[])
+
+        data = load_state(state_file)
+        assert data["integrity_ok"] is True
+        assert data["nodes"] == nodes
+
+        # Same-size edit right after the save
+        raw = state_file.read_bytes()
+        state_file.write_bytes(raw.replace(b"2.0", b"1.0"))
+
+        data = load_state(state_file)
+        assert data["integrity_ok"] is False
+        assert data["nodes"][0]["allocated"]["CPU"] == 1.0
+
+    def test_reload_after_save_returns_copies(self, tmp_path):
+        """Test reloading a just-saved file isn't affected by mutating the saved or loaded dicts."""
+        state_file = tmp_path / "test_state.json"
+        nodes = [{"node_id": "n1", "quotas": {"CPU": 4.0}, "allocated": {"CPU": 2.0}, "status": "active"}]
+        save_state(state_file, nodes=nodes, chain=[], audit_events=[])
+
+        nodes[0]["status"] = "removed"
+        data = load_state(state_file)
+        assert data["nodes"][0]["status"] == "active"
+
+        data["nodes"][0]["status"] = "removed"
+        assert load_state(state_file)["nodes"][0]["status"] == "active"
+
+    def test_large_state_is_compressed(self, tmp_path, monkeypatch):
+        """Test that state above COMPRESS_ABOVE is written compressed and loads back."""
+        import persistence
+        monkeypatch.setattr(persistence, "COMPRESS_ABOVE", 0)
+        state_file = tmp_path / "test_state.json"
+        nodes = [{"node_id": f"n{i}", "quotas": {"CPU": 4.0}, "allocated": {"CPU": 0.0}, "status": "active"}
+                 for i in range(100)]
+        save_state(state_file, nodes=nodes, chain=[], audit_events=[])
+
+        raw = state_file.read_bytes()
+        assert raw.startswith(b"BOSZ")
+        assert len(raw) < len(json.dumps(nodes))
+
+        # Force a real read rather than the just-saved shortcut
+        monkeypatch.setattr(persistence, "_last_saved", None)
+        data = load_state(state_file)
+        assert data["integrity_ok"] is True
+        assert data["nodes"] == nodes
+
+    def test_load_file_with_non_finite_floats(self, tmp_path):
+        """Test that Infinity/NaN tokens written by the stdlib encoder load back."""
+        state_file = tmp_path / "test_state.json"
+        nodes = [{"node_id": "n1", "quotas": {"CPU": float("inf")}, "allocated": {"CPU": 0.0}, "status": "active"}]
+        checksum = compute_data_checksum(nodes, [], [])
+        state_file.write_text(json.dumps({"nodes": nodes, "chain": [], "audit_events": [], "checksum": checksum}))
+
+        data = load_state(state_file)
+        assert data["integrity_ok"] is True
+        assert data["nodes"][0]["quotas"]["CPU"] == float("inf")
+
+    def test_load_file_with_big_ints(self, tmp_path):
+        """Test that integers beyond 64 bits load back exactly."""
+        state_file = tmp_path / "test_state.json"
+        audit_events = [{"timestamp": 1234.5, "node_id": "n1", "action": "a", "outcome": "o",
+                         "details": {"big": 2 ** 70}}]
+        checksum = compute_data_checksum([], [], audit_events)
+        state_file.write_text(json.dumps({"nodes": [], "chain": [], "audit_events": audit_events, "checksum": checksum}))
+
+        data = load_state(state_file)
+        assert data["integrity_ok"] is True
+        assert data["audit_events"][0]["details"]["big"] == 2 ** 70
+
+    def test_save_non_string_keys_and_big_ints(self, tmp_path, monkeypatch):
+        """Test that values the stdlib encodes but orjson rejects still save."""
+        import persistence
+        state_file = tmp_path / "test_state.json"
+        audit_events = [{"timestamp": 1234.5, "node_id": "n1", "action": "a", "outcome": "o",
+                         "details": {1: "x"}}]
+        save_state(state_file, nodes=[], chain=[], audit_events=audit_events)
+
+        monkeypatch.setattr(persistence, "_last_saved", None)
+        data = load_state(state_file)
+        assert data["integrity_ok"] is True
+        assert data["audit_events"][0]["details"] == {"1": "x"}
+
+        audit_events[0]["details"] = {"big": 2 ** 70}
+        save_state(state_file, nodes=[], chain=[], audit_events=audit_events)
+        assert str(2 ** 70).encode() in state_file.read_bytes()
+
+    def test_none_values_keep_indented_output(self, tmp_path):
+        """Test that None values alone don't switch the file to the stdlib encoding."""
+        pytest.importorskip("orjson")
+        state_file = tmp_path / "test_state.json"
+        audit_events = [{"timestamp": 1234.5, "node_id": None, "action": "a", "outcome": "o",
+                         "details": {"reason": None}}]
+        save_state(state_file, nodes=[], chain=[], audit_events=audit_events)
+
+        assert b'\n  "audit_events"' in state_file.read_bytes()
+
+    def test_checksum_matches_canonical_json(self):
+        """Test the streamed checksum hashes the same bytes as sort_keys JSON."""
+        nodes = [{"node_id": "n1", "quotas": {"CPU": 4.0}, "allocated": {"CPU": 2.0}, "status": "active"}]
+        chain = [{"index": 0, "timestamp": 1234.5, "transactions": [], "previous_hash": "0", "nonce": 0, "hash": "g"}]
+        audit_events = [{"timestamp": 1234.5, "node_id": "n1", "action": "add_node", "outcome": "created", "details": {"b": 1, "a": 2}}]
+
+        expected = hashlib.sha256(json.dumps({
+            "nodes": nodes,
+            "chain": chain,
+            "audit_events": audit_events,
+        }, sort_keys=True).encode("utf-8")).hexdigest()
+
+        assert compute_data_checksum(nodes, chain, audit_events) == expected
+        chain_json = [json.dumps(b, sort_keys=True).encode("utf-8") for b in chain]
+        assert compute_data_checksum(nodes, chain, audit_events, chain_json=chain_json) == expected
 
 
 class TestOrchestratorCommands:
     """Test MainController command handling."""
 
-    def test_add_node_command(self):
+    def test_add_node_command(self, controller):
         """Test add_node command through orchestrator."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state_file = str(Path(tmpdir) / "test_state.json")
-            controller = MainController(state_file=state_file, difficulty=1)
+        result = controller.handle_command("add_node node1 4.0 8.0")
+        assert result["success"] is True
+        assert "node1" in result["message"]
 
-            result = controller.handle_command("add_node node1 4.0 8.0")
-            assert result["success"] is True
-            assert "node1" in result["message"]
+        # Verify node was added
+        assert "node1" in controller.cli.resource_manager.nodes
 
-            # Verify node was added
-            assert "node1" in controller.cli.resource_manager.nodes
-
-    def test_invalid_command(self):
+    def test_invalid_command(self, controller):
         """Test handling of invalid command."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state_file = str(Path(tmpdir) / "test_state.json")
-            controller = MainController(state_file=state_file, difficulty=1)
-
-            result = controller.handle_command("invalid_command")
-            assert result["success"] is False
-            assert "Unknown command" in result["message"]
+        result = controller.handle_command("invalid_command")
+        assert result["success"] is False
+        assert "Unknown command" in result["message"]
 
-    def test_request_resource_command(self):
+    def test_request_resource_command(self, controller):
         """Test resource request through orchestrator."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state_file = str(Path(tmpdir) / "test_state.json")
-            controller = MainController(state_file=state_file, difficulty=1)
+        # Add nodes first
+        controller.handle_command("add_node node1 4.0")
+        controller.handle_command("add_node node2 4.0")
 
-            # Add nodes first
-            controller.handle_command("add_node node1 4.0")
-            controller.handle_command("add_node node2 4.0")
+        # Request resource
+        result = controller.handle_command("request_resource node1 CPU 2.0")
+        assert result["success"] is True
+        assert "block" in result["message"].lower()
 
-            # Request resource
-            result = controller.handle_command("request_resource node1 CPU 2.0")
-            assert result["success"] is True
-            assert "block" in result["message"].lower()
-
-    def test_view_chain_command(self):
+    def test_view_chain_command(self, controller):
         """Test view_chain command."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state_file = str(Path(tmpdir) / "test_state.json")
-            controller = MainController(state_file=state_file, difficulty=1)
-
-            result = controller.handle_command("view_chain")
-            assert result["success"] is True
-            assert "chain" in result["data"]
-            # Should have at least genesis block
-            assert len(result["data"]["chain"]) >= 1
-
-    def test_status_command(self):
+        result = controller.handle_command("view_chain")
+        assert result["success"] is True
+        assert "chain" in result["data"]
+        # Should have at least genesis block
+        assert len(result["data"]["chain"]) >= 1
+
+    def test_quiet_controller_prints_no_narration(self, controller, capsys):
+        """Test that a controller built with verbose=False runs consensus silently."""
+        controller.handle_command("add_node node1 4.0")
+        controller.handle_command("add_node node2 4.0")
+        result = controller.handle_command("request_resource node1 CPU 1.0")
+        assert result["success"] is True
+        assert capsys.readouterr().out == ""
+
+    def test_status_command(self, controller):
         """Test status command."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state_file = str(Path(tmpdir) / "test_state.json")
-            controller = MainController(state_file=state_file, difficulty=1)
-
-            result = controller.handle_command("status")
-            assert result["success"] is True
-            assert "timestamp" in result["data"]
-            assert "node_ids" in result["data"]
-            assert "blockchain" in result["data"]
-            assert "total_blocks" in result["data"]["blockchain"]
-            assert "resources" in result["data"]
-            assert "consensus" in result["data"]
+        result = controller.handle_command("status")
+        assert result["success"] is True
+        assert "timestamp" in result["data"]
+        assert "node_ids" in result["data"]
+        assert "blockchain" in result["data"]
+        assert "total_blocks" in result["data"]["blockchain"]
+        assert "resources" in result["data"]
+        assert "consensus" in result["data"]
 
 
 class TestStatePersistence:
     """Test state persistence across controller restarts."""
 
-    def test_state_survives_restart(self):
+    def test_state_survives_restart(self, tmp_path):
         """Test that state is preserved across controller restarts."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state_file = str(Path(tmpdir) / "test_state.json")
+        state_file = str(tmp_path / "test_state.json")
+
+        # First controller: add nodes and make transactions
+        controller1 = MainController(state_file=state_file, difficulty=1)
+        controller1.handle_command("add_node node1 4.0 8.0")
+        controller1.handle_command("add_node node2 4.0 8.0")
+        controller1.handle_command("request_resource node1 CPU 2.0")
+
+        # Check state
+        assert len(controller1.cli.blockchain.chain) >= 2  # genesis + 1 transaction block
+        assert "node1" in controller1.cli.resource_manager.nodes
+
+        # Simulate restart by creating new controller with same state file
+        controller2 = MainController(state_file=state_file, difficulty=1)
+
+        # Verify state was loaded
+        assert len(controller2.cli.blockchain.chain) >= 2
+        assert "node1" in controller2.cli.resource_manager.nodes
+        assert "node2" in controller2.cli.resource_manager.nodes
+
+        # Verify allocation was preserved
+        node1 = controller2.cli.resource_manager.nodes["node1"]
+        assert node1.allocated["CPU"] == 2.0
+
+    def test_infinite_quota_survives_restart(self, tmp_path, monkeypatch):
+        """Test that a non-finite quota round-trips without a checksum mismatch."""
+        import persistence
+        state_file = str(tmp_path / "test_state.json")
+
+        controller1 = MainController(state_file=state_file, difficulty=1)
+        assert controller1.handle_command("add_node n1 inf 1")["success"] is True
+
+        # Read the file back rather than the just-saved copy
+        monkeypatch.setattr(persistence, "_last_saved", None)
+        controller2 = MainController(state_file=state_file, difficulty=1)
+
+        assert controller2.cli.file_tampered is False
+        assert controller2.cli.resource_manager.nodes["n1"].quotas["CPU"] == float("inf")
+
+    def test_block_missing_field_with_recomputed_checksum(self, tmp_path, monkeypatch):
+        """Test that a hand-edited chain with a valid checksum still loads and fails validation."""
+        import persistence
+        state_file = tmp_path / "test_state.json"
+
+        controller1 = MainController(state_file=str(state_file), difficulty=1)
+        controller1.handle_command("add_node node1 4.0")
+
+        # Drop a field from a block and recompute the checksum, as the tamper demo does
+        data = json.loads(state_file.read_text())
+        del data["chain"][1]["previous_hash"]
+        data["checksum"] = compute_data_checksum(data["nodes"], data["chain"], data["audit_events"])
+        state_file.write_text(json.dumps(data))
+        monkeypatch.setattr(persistence, "_last_saved", None)
+
+        controller2 = MainController(state_file=str(state_file), difficulty=1)
+        result = controller2.handle_command("validate_chain")
+        assert result["success"] is False
+
+    def test_block_edited_in_memory_is_saved_consistently(self, tmp_path, monkeypatch):
+        """Test that a block edited in memory is saved with a matching checksum."""
+        import persistence
+        state_file = tmp_path / "test_state.json"
+
+        controller1 = MainController(state_file=str(state_file), difficulty=1)
+        controller1.handle_command("add_node node1 4.0")
+        controller1.handle_command("add_node node2 4.0")
+        controller1.handle_command("request_resource node1 CPU 1.0")
+
+        # The block was encoded for the last save; edit it and save again
+        controller1.cli.blockchain.chain[3].transactions[0]['amount'] = 9999
+        controller1.handle_command("request_resource node1 CPU 1.0")
+
+        monkeypatch.setattr(persistence, "_last_saved", None)
+        data = load_state(state_file)
+        assert data["integrity_ok"] is True
+        assert data["chain"][3]["transactions"][0]["amount"] == 9999
+
+        # The edit is caught by chain validation instead
+        controller2 = MainController(state_file=str(state_file), difficulty=1)
+        result = controller2.handle_command("validate_chain")
+        assert result["success"] is False
+        assert "Blockchain invalid" in result["message"]
+
+    def test_audit_log_persistence(self, tmp_path):
+        """Test that audit logs are preserved across restarts."""
+        state_file = str(tmp_path / "test_state.json")
 
-            # First controller: add nodes and make transactions
-            controller1 = MainController(state_file=state_file, difficulty=1)
-            controller1.handle_command("add_node node1 4.0 8.0")
-            controller1.handle_command("add_node node2 4.0 8.0")
-            controller1.handle_command("request_resource node1 CPU 2.0")
+        # First controller: generate some audit events
+        controller1 = MainController(state_file=state_file, difficulty=1)
+        controller1.handle_command("add_node node1 4.0")
 
-            # Check state
-            assert len(controller1.cli.blockchain.chain) >= 2  # genesis + 1 transaction block
-            assert "node1" in controller1.cli.resource_manager.nodes
+        result1 = controller1.handle_command("print_audit")
+        events1 = result1["data"]["events"]
+        assert len(events1) > 0
 
-            # Simulate restart by creating new controller with same state file
-            controller2 = MainController(state_file=state_file, difficulty=1)
+        # Second controller: verify audit log persisted
+        controller2 = MainController(state_file=state_file, difficulty=1)
+        result2 = controller2.handle_command("print_audit")
+        events2 = result2["data"]["events"]
 
-            # Verify state was loaded
-            assert len(controller2.cli.blockchain.chain) >= 2
-            assert "node1" in controller2.cli.resource_manager.nodes
-            assert "node2" in controller2.cli.resource_manager.nodes
+        assert len(events2) == len(events1)
 
-            # Verify allocation was preserved
-            node1 = controller2.cli.resource_manager.nodes["node1"]
-            assert node1.allocated["CPU"] == 2.0
 
-    def test_audit_log_persistence(self):
-        """Test that audit logs are preserved across restarts."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state_file = str(Path(tmpdir) / "test_state.json")
+    def test_loading_state_does_not_rewrite_file(self, tmp_path):
+        """Test that starting up on an existing state file leaves it untouched."""
+        state_file = tmp_path / "test_state.json"
 
-            # First controller: generate some audit events
-            controller1 = MainController(state_file=state_file, difficulty=1)
-            controller1.handle_command("add_node node1 4.0")
+        controller1 = MainController(state_file=str(state_file), difficulty=1)
+        controller1.handle_command("add_node node1 4.0")
+        before = state_file.stat()
+
+        controller2 = MainController(state_file=str(state_file), difficulty=1)
+        controller2.handle_command("status")
+        controller2.stop()
 
-            result1 = controller1.handle_command("print_audit")
-            events1 = result1["data"]["events"]
-            assert len(events1) > 0
+        # save_state replaces the file, so a rewrite would change the inode
+        assert state_file.stat().st_ino == before.st_ino
+        assert "node1" in controller2.cli.resource_manager.nodes
 
-            # Second controller: verify audit log persisted
-            controller2 = MainController(state_file=state_file, difficulty=1)
-            result2 = controller2.handle_command("print_audit")
-            events2 = result2["data"]["events"]
+    def test_batched_commands_persist_on_exit(self, tmp_path):
+        """Test that batched commands write the state file once, on exit."""
+        state_file = str(tmp_path / "test_state.json")
 
-            assert len(events2) == len(events1)
+        controller1 = MainController(state_file=state_file, difficulty=1)
+        with controller1.batched():
+            controller1.handle_command("add_node node1 4.0")
+            controller1.handle_command("add_node node2 4.0")
+            # Nothing written while the batch is open
+            assert not Path(state_file).exists()
+
+        controller2 = MainController(state_file=state_file, difficulty=1)
+        assert "node1" in controller2.cli.resource_manager.nodes
+        assert "node2" in controller2.cli.resource_manager.nodes
+        assert len(controller2.cli.blockchain.chain) == 3
+
+    def test_failed_flush_is_retried(self, tmp_path, monkeypatch):
+        """Test that changes stay pending when writing the state file fails."""
+        import cli.cli
+        state_file = str(tmp_path / "test_state.json")
+        controller1 = MainController(state_file=state_file, difficulty=1)
+
+        def failing_save_state(*args, **kwargs):
+            raise OSError("No space left on device")
+
+        with monkeypatch.context() as m:
+            m.setattr(cli.cli, "save_state", failing_save_state)
+            with pytest.raises(OSError):
+                with controller1.batched():
+                    controller1.handle_command("add_node node1 4.0")
+        assert not Path(state_file).exists()
+
+        controller1.flush()
+        controller2 = MainController(state_file=state_file, difficulty=1)
+        assert "node1" in controller2.cli.resource_manager.nodes
+
+
+def _recvn(sock, n):
+    """Read exactly n bytes from a socket."""
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("socket closed mid-frame")
+        buf += chunk
+    return bytes(buf)
+
+
+def _recv_response(sock):
+    """Read one length-prefixed JSON response from the socket API."""
+    n = struct.unpack(">I", _recvn(sock, 4))[0]
+    return json.loads(_recvn(sock, n).decode('utf-8'))
+
+
+def send_cmd(sock, command):
+    """Send one command over the socket API and return its response."""
+    sock.sendall(json.dumps({"command": command}).encode('utf-8'))
+    return _recv_response(sock)
+
+
+@pytest.fixture(scope="class", params=["tcp", "unix"])
+def socket_client(request, tmp_path_factory):
+    """A controller serving the socket API and one client connected to it.
+
+    Both are shared by the tests of a class, once per transport, so the
+    controller starts and the client connects only once per transport.
+    """
+    if request.param == "unix" and not hasattr(socket, "AF_UNIX"):
+        pytest.skip("Unix domain sockets not available")
+    tmp_path = tmp_path_factory.mktemp("socket_api")
+    controller = MainController(state_file=str(tmp_path / "test_state.json"), difficulty=1, verbose=False)
+    controller.start()
+    if request.param == "unix":
+        address = str(tmp_path / "sock")
+        controller.start_socket_api(unix_path=address)
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        controller.start_socket_api(host='localhost', port=0)  # Use port 0 for random available port
+        address = ('localhost', controller.socket_server.getsockname()[1])
+        client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        # start_socket_api() returns with the server listening, so connect straight away
+        client.connect(address)
+        yield controller, client
+    finally:
+        client.close()
+        controller.stop()
 
 
 class TestSocketAPI:
     """Test socket API functionality."""
 
-    def test_socket_api_basic_command(self):
+    def test_socket_api_basic_command(self, socket_client):
         """Test basic command through socket API."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state_file = str(Path(tmpdir) / "test_state.json")
-            controller = MainController(state_file=state_file, difficulty=1)
-
-            # Start controller and socket API
-            controller.start()
-            controller.start_socket_api(host='localhost', port=0)  # Use port 0 for random available port
+        controller, client = socket_client
 
-            # Get the actual port assigned
-            actual_port = controller.socket_server.getsockname()[1]
+        response = send_cmd(client, "status")
 
-            try:
-                # Give server a moment to start
-                time.sleep(0.1)
+        assert response["success"] is True
+        assert "data" in response
+        assert "blockchain" in response["data"]
+        assert "total_blocks" in response["data"]["blockchain"]
 
-                # Connect and send command
-                client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                client.connect(('localhost', actual_port))
-
-                # Send status command
-                request = json.dumps({"command": "status"})
-                client.sendall(request.encode('utf-8'))
-
-                # Receive response
-                response_data = client.recv(4096)
-                response = json.loads(response_data.decode('utf-8'))
-
-                assert response["success"] is True
-                assert "data" in response
-                assert "blockchain" in response["data"]
-                assert "total_blocks" in response["data"]["blockchain"]
-
-                client.close()
-
-            finally:
-                controller.stop()
-
-    def test_socket_api_add_node(self):
+    def test_socket_api_add_node(self, socket_client):
         """Test adding node through socket API."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            state_file = str(Path(tmpdir) / "test_state.json")
-            controller = MainController(state_file=state_file, difficulty=1)
-
-            controller.start()
-            controller.start_socket_api(host='localhost', port=0)
-            actual_port = controller.socket_server.getsockname()[1]
-
-            try:
-                time.sleep(0.1)
-
-                client = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                client.connect(('localhost', actual_port))
-
-                # Add a node
-                request = json.dumps({"command": "add_node test_node 4.0 8.0"})
-                client.sendall(request.encode('utf-8'))
-
-                response_data = client.recv(4096)
-                response = json.loads(response_data.decode('utf-8'))
-
-                assert response["success"] is True
-                assert "test_node" in response["message"]
-
-                client.close()
-
-                # Verify node was actually added
-                assert "test_node" in controller.cli.resource_manager.nodes
-
-            finally:
-                controller.stop()
-
+        controller, client = socket_client
+
+        response = send_cmd(client, "add_node test_node 4.0 8.0")
+
+        assert response["success"] is True
+        assert "test_node" in response["message"]
+
+        # Verify node was actually added
+        assert "test_node" in controller.cli.resource_manager.nodes
+
+        # The same connection keeps serving commands
+        response = send_cmd(client, "status")
+        assert response["success"] is True
+
+    def test_socket_api_serves_several_clients(self, socket_client):
+        """Test that a second client is served while the first stays connected."""
+        controller, client = socket_client
+        with socket.socket(client.family, socket.SOCK_STREAM) as other:
+            other.connect(client.getpeername())
+
+            assert send_cmd(other, "status")["success"] is True
+            assert send_cmd(client, "status")["success"] is True
+            assert send_cmd(other, "view_chain")["success"] is True
+
+    def test_socket_api_stalled_client_does_not_block_others(self, socket_client, monkeypatch):
+        """Test that a client not reading a large response doesn't stall the others."""
+        controller, client = socket_client
+        monkeypatch.setattr(controller.cli, "view_chain", lambda: ["x" * 1024] * 10240)
+        with socket.socket(client.family, socket.SOCK_STREAM) as stalled, \
+                socket.socket(client.family, socket.SOCK_STREAM) as other:
+            stalled.connect(client.getpeername())
+            other.connect(client.getpeername())
+            other.settimeout(5)
+
+            # ~10 MB response that the stalled client never reads
+            stalled.sendall(json.dumps({"command": "view_chain"}).encode('utf-8'))
+            assert send_cmd(other, "status")["success"] is True
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets not available")
+    def test_stop_removes_unix_socket_file(self, tmp_path):
+        """Test that stopping the socket API removes its Unix socket file."""
+        unix_path = str(tmp_path / "sock")
+        controller = MainController(state_file=str(tmp_path / "test_state.json"), difficulty=1)
+        controller.start()
+        controller.start_socket_api(unix_path=unix_path)
+        assert os.path.exists(unix_path)
+
+        controller.stop()
+        assert not os.path.exists(unix_path)
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])